@@ -0,0 +1,167 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Customers per chunk when accumulating X.T @ X. Each chunk's purchase
+# matrix is built from just the orders of that customer-key range, so peak
+# memory is one chunk plus the item x item result; the full customer x item
+# matrix never exists.
+CHUNK_SIZE = 250_000
+
+
+# ----------------------------------------
+# 1. ITEM COLUMNS
+# ----------------------------------------
+
+def item_columns(products, level="Product"):
+
+    # Product_Key -> matrix column, as a small lookup array on the dimension
+    keys = products["Product_Key"].to_numpy()
+    if level == "Product":
+        order = np.argsort(keys)
+        labels = products["Product"].to_numpy()[order].tolist()
+        codes = np.empty(len(keys), dtype=np.int64)
+        codes[order] = np.arange(len(keys))
+    else:
+        codes, labels = pd.factorize(products["Category"], sort=True)
+        labels = list(labels)
+
+    col_of_key = np.full(keys.max() + 1, -1, dtype=np.int64)
+    col_of_key[keys] = codes
+
+    return col_of_key, labels
+
+
+# ----------------------------------------
+# 2. CO-OCCURRENCE (CHUNKED BY CUSTOMER KEY)
+# ----------------------------------------
+
+def chunk_matrix(customer_key, product_key, col_of_key, n_items, lo, hi):
+
+    # Binary customer x item matrix for customers in [lo, hi) only
+    rows = np.flatnonzero((customer_key >= lo) & (customer_key < hi))
+    X = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32),
+         (customer_key[rows] - lo, col_of_key[product_key[rows]])),
+        shape=(hi - lo, n_items)
+    )
+    X.data[:] = 1
+
+    return X
+
+
+def co_occurrence(df, col_of_key, n_items, chunk_size=CHUNK_SIZE):
+
+    customer_key = df["Customer_Key"].to_numpy()
+    product_key = df["Product_Key"].to_numpy()
+    n_keys = int(customer_key.max()) + 1
+
+    counts = sparse.csr_matrix((n_items, n_items), dtype=np.float64)
+    n_customers = 0
+
+    for lo in range(0, n_keys, chunk_size):
+        hi = min(lo + chunk_size, n_keys)
+        chunk = chunk_matrix(customer_key, product_key, col_of_key, n_items, lo, hi)
+        n_customers += int((np.diff(chunk.indptr) > 0).sum())
+        counts = counts + (chunk.T @ chunk).astype(np.float64)
+
+    return counts, n_customers
+
+
+def affinity_scores(counts, n_customers):
+
+    # Diagonal = customers who bought the item at all
+    support = counts.diagonal()
+    coo = sparse.triu(counts, k=1).tocoo()
+
+    pairs = pd.DataFrame({"i": coo.row, "j": coo.col, "Co_Customers": coo.data})
+    pairs = pd.concat([
+        pairs,
+        pairs.rename(columns={"i": "j", "j": "i"})
+    ], ignore_index=True)
+
+    pairs["Confidence"] = pairs["Co_Customers"] / support[pairs["i"]]
+    pairs["Lift"] = (
+        pairs["Co_Customers"] * n_customers
+        / (support[pairs["i"]] * support[pairs["j"]])
+    )
+
+    return pairs, support
+
+
+# ----------------------------------------
+# 3. TOP-N RELATED ITEMS
+# ----------------------------------------
+
+def related_items(pairs, labels, top_n=5, min_co_customers=1):
+
+    pairs = pairs[pairs["Co_Customers"] >= min_co_customers]
+    pairs = pairs.sort_values(["i", "Lift"], ascending=[True, False])
+    top = pairs.groupby("i").head(top_n)
+
+    names = np.asarray(labels, dtype=object)
+    return pd.DataFrame({
+        "Item": names[top["i"]],
+        "Also_Bought": names[top["j"]],
+        "Co_Customers": top["Co_Customers"].astype(int).to_numpy(),
+        "Confidence_%": (top["Confidence"] * 100).round(2).to_numpy(),
+        "Lift": top["Lift"].round(3).to_numpy()
+    })
+
+
+# ----------------------------------------
+# MAIN FUNCTION
+# ----------------------------------------
+
+def run_affinity(df, products, level="Product", top_n=5, chunk_size=CHUNK_SIZE):
+
+    col_of_key, labels = item_columns(products, level)
+    counts, n_customers = co_occurrence(df, col_of_key, len(labels), chunk_size)
+    pairs, _ = affinity_scores(counts, n_customers)
+
+    return related_items(pairs, labels, top_n)
+
+
+# ----------------------------------------
+# BENCHMARK: BUILD TIME & PEAK MEMORY
+# ----------------------------------------
+
+def _measure(df, products, chunk_size):
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    run_affinity(df, products, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def benchmark_build(customer_counts=(10_000, 100_000, 1_000_000), orders_per_customer=5,
+                    chunk_sizes=(1_000_000, CHUNK_SIZE, 10_000)):
+
+    from src.data_generator import generate_sales_data
+
+    rows = []
+    for n_customers in customer_counts:
+        tables = generate_sales_data(n_customers * orders_per_customer, n_customers)
+
+        for chunk_size in chunk_sizes:
+            elapsed, peak = _measure(tables["orders"], tables["products"], chunk_size)
+            rows.append({
+                "Customers": n_customers,
+                "Orders": len(tables["orders"]),
+                "Chunk_Size": chunk_size,
+                "Build_Seconds": round(elapsed, 3),
+                "Peak_MB": round(peak / 1024 ** 2, 1)
+            })
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark_build().to_string(index=False))
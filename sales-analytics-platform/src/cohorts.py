@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# ----------------------------------------
+# 1. CUSTOMER x ACTIVITY-MONTH MATRIX
+# ----------------------------------------
+
+def _order_coordinates(df):
+
+    # Customer_Key is already a dense integer, so it is used directly as the
+    # row index; columns are months since the first month in the data
+    month = (df["Year"].to_numpy().astype(np.int64) * 12
+             + df["Month"].to_numpy().astype(np.int64) - 1)
+    first_month = month.min()
+
+    return df["Customer_Key"].to_numpy(), month - first_month, first_month
+
+
+def build_activity_matrix(df):
+
+    row, col, first_month = _order_coordinates(df)
+    shape = (row.max() + 1, col.max() + 1)
+
+    # Orders per (customer, month); duplicates are summed on conversion
+    activity = sparse.csr_matrix(
+        (np.ones(len(df), dtype=np.int32), (row, col)), shape=shape
+    )
+    activity.sort_indices()
+
+    months = pd.period_range(
+        pd.Period(year=first_month // 12, month=first_month % 12 + 1, freq="M"),
+        periods=shape[1], freq="M"
+    )
+
+    return activity, months
+
+
+# ----------------------------------------
+# 2. COHORT ASSIGNMENT
+# ----------------------------------------
+
+def first_purchase_month(activity):
+
+    # With sorted CSR indices the first stored column of each row is that
+    # customer's first active month; -1 marks customers with no orders
+    nnz = np.diff(activity.indptr)
+    first = np.full(activity.shape[0], -1, dtype=np.int64)
+    active = nnz > 0
+    first[active] = activity.indices[activity.indptr[:-1][active]]
+
+    return first
+
+
+def _cohort_age(activity, first):
+
+    rows = np.repeat(np.arange(activity.shape[0]), np.diff(activity.indptr))
+    cohort = first[rows]
+    age = activity.indices - cohort
+
+    return cohort, age
+
+
+# ----------------------------------------
+# 3. RETENTION & REVENUE MATRICES
+# ----------------------------------------
+
+def cohort_tables(df):
+
+    activity, months = build_activity_matrix(df)
+    n_months = len(months)
+
+    # Active customers: one count per stored (customer, month) entry
+    first = first_purchase_month(activity)
+    cohort, age = _cohort_age(activity, first)
+
+    active = np.bincount(cohort * n_months + age, minlength=n_months * n_months)
+    active = active.reshape(n_months, n_months)
+
+    # Revenue: each order lands in its customer's cohort row
+    row, col, _ = _order_coordinates(df)
+    order_cohort = first[row]
+    cohort_revenue = np.bincount(
+        order_cohort * n_months + (col - order_cohort),
+        weights=df["Revenue"].to_numpy(dtype=np.float64),
+        minlength=n_months * n_months
+    ).reshape(n_months, n_months)
+
+    sizes = active[:, 0]
+    keep = sizes > 0
+
+    index = pd.Index(months[keep], name="Cohort")
+    columns = pd.Index(np.arange(n_months), name="Months_Since_First")
+
+    # Cells beyond the observed window are undefined, not zero
+    observable = np.arange(n_months)[None, :] < (n_months - np.arange(n_months))[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(observable, active / sizes[:, None], np.nan)
+
+    return {
+        "sizes": pd.Series(sizes[keep], index=index, name="Customers"),
+        "active": pd.DataFrame(np.where(observable, active, np.nan)[keep], index=index, columns=columns),
+        "retention": pd.DataFrame(rate[keep] * 100, index=index, columns=columns),
+        "revenue": pd.DataFrame(np.where(observable, cohort_revenue, np.nan)[keep], index=index, columns=columns)
+    }
+
+
+def retention_curve(tables):
+
+    # Size-weighted average over every cohort old enough to observe each age
+    active = tables["active"]
+    sizes = tables["sizes"]
+
+    observed_sizes = active.notna().mul(sizes, axis=0).sum()
+    curve = active.sum() / observed_sizes * 100
+
+    return curve[observed_sizes > 0].rename("Retention_%")
+
+
+# ----------------------------------------
+# MAIN FUNCTION
+# ----------------------------------------
+
+def run_cohort_analysis(df):
+
+    tables = cohort_tables(df)
+    tables["curve"] = retention_curve(tables)
+
+    return tables
@@ -3,6 +3,8 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 
+from src.data_loader import RAW_DIR, PAISE, save_star_schema, to_paise, customer_ids
+
 np.random.seed(42)
 random.seed(42)
 
@@ -65,119 +67,186 @@ PAYMENT_METHODS = ["UPI", "Credit Card", "Debit Card", "COD"]
 # PRICE GENERATOR
 # -----------------------------------
 
-def generate_price(category):
-    price_ranges = {
-        "Electronics": (5000, 80000),
-        "Fashion": (500, 5000),
-        "Home & Kitchen": (1000, 25000),
-        "Grocery": (100, 2000),
-        "Accessories": (300, 4000)
-    }
-    return round(np.random.uniform(*price_ranges[category]), 2)
+PRICE_RANGES = {
+    "Electronics": (5000, 80000),
+    "Fashion": (500, 5000),
+    "Home & Kitchen": (1000, 25000),
+    "Grocery": (100, 2000),
+    "Accessories": (300, 4000)
+}
+
+# -----------------------------------
+# DIMENSION TABLES
+# -----------------------------------
+
+def build_geography_dim():
+    cities = list(CITY_REGION.keys())
+    return pd.DataFrame({
+        "Geo_Key": np.arange(1, len(cities) + 1),
+        "City": cities,
+        "Region": [CITY_REGION[c] for c in cities]
+    })
+
+
+def build_product_dim():
+    rows = [
+        (product, category)
+        for category, products in CATEGORIES.items()
+        for product in products
+    ]
+    products = pd.DataFrame(rows, columns=["Product", "Category"])
+    products.insert(0, "Product_Key", np.arange(1, len(products) + 1))
+    return products
 
 # -----------------------------------
 # CUSTOMER GENERATION
 # -----------------------------------
 
-CUSTOMER_IDS = [f"CUST_{i}" for i in range(1, 1201)]
+NUM_CUSTOMERS = 1200
+
+# Zipf exponent for purchase frequency: a few customers buy very often
+# while the typical customer places a handful of orders (with the defaults
+# the median is about 4 and the heaviest buyer has well over 100)
+CUSTOMER_SKEW = 0.6
+
+AGE_BANDS = [(18, 25), (26, 35), (36, 50), (50, 65)]
+AGE_BAND_P = [0.2, 0.35, 0.3, 0.15]
 
-def generate_customer():
-    customer_id = random.choice(CUSTOMER_IDS)
-    age = np.random.choice(
-        [np.random.randint(18,25),
-         np.random.randint(26,35),
-         np.random.randint(36,50),
-         np.random.randint(50,65)],
-        p=[0.2, 0.35, 0.3, 0.15]
-    )
-    gender = np.random.choice(["Male", "Female"], p=[0.55, 0.45])
-    city = random.choice(list(CITY_REGION.keys()))
-    region = CITY_REGION[city]
-    return customer_id, age, gender, city, region
+
+def generate_customers(n_customers=NUM_CUSTOMERS, geography=None):
+    if geography is None:
+        geography = build_geography_dim()
+
+    # Attributes are drawn once per customer so every order agrees
+    band = np.random.choice(len(AGE_BANDS), size=n_customers, p=AGE_BAND_P)
+    low = np.array([b[0] for b in AGE_BANDS])[band]
+    high = np.array([b[1] for b in AGE_BANDS])[band]
+    age = np.random.randint(low, high)
+
+    gender = np.random.choice(["Male", "Female"], size=n_customers, p=[0.55, 0.45])
+    geo_key = np.random.choice(geography["Geo_Key"].to_numpy(), size=n_customers)
+
+    keys = np.arange(1, n_customers + 1)
+    return pd.DataFrame({
+        "Customer_Key": keys,
+        "Customer_ID": customer_ids(keys),
+        "Age": age,
+        "Gender": gender,
+        "Geo_Key": geo_key
+    })
+
+
+def customer_weights(n_customers=NUM_CUSTOMERS, skew=CUSTOMER_SKEW):
+    # Zipf-like weights, shuffled so customer key order is not rank order
+    weights = 1.0 / np.arange(1, n_customers + 1) ** skew
+    np.random.shuffle(weights)
+    return weights / weights.sum()
 
 # ----------------------------------
 # MAIN DATA GENERATION
 # ----------------------------------
 
-def generate_sales_data():
-    data = []
-    date_range = pd.date_range(start=START_DATE, end=END_DATE)
+def generate_sales_data(total_rows=TOTAL_ROWS, n_customers=NUM_CUSTOMERS, fixed_point=True):
+    geography = build_geography_dim()
+    products = build_product_dim()
+    customers = generate_customers(n_customers, geography)
 
-    for i in range(TOTAL_ROWS):
-        order_date = random.choice(date_range)
-        year = order_date.year
-        month = order_date.month
-        quarter = (month - 1) // 3 + 1
-
-        growth_factor = YEAR_GROWTH[year]
-        seasonal_factor = MONTH_MULTIPLIER[month]
-
-        # COVID dip logic
-        if year == 2020 and month in [4,5,6,7,8]:
-            seasonal_factor *= 0.75
-
-        category = random.choice(list(CATEGORIES.keys()))
-        product = random.choice(CATEGORIES[category])
-
-        unit_price = generate_price(category)
-        quantity = np.random.randint(1, 5)
-
-        discount = round(np.random.uniform(0, 0.1), 2)
-        if month in [10, 11]:
-            discount = round(np.random.uniform(0.1, 0.3), 2)
-
-        cost_price = round(unit_price * np.random.uniform(0.6, 0.75), 2)
-
-        revenue = unit_price * quantity * (1 - discount)
-        revenue *= growth_factor * seasonal_factor
-
-        profit = revenue - (cost_price * quantity)
-        profit_margin = profit / revenue if revenue > 0 else 0
-
-        payment_method = np.random.choice(
-            PAYMENT_METHODS,
-            p=[0.4, 0.3, 0.2, 0.1]
-        )
-
-        customer_id, age, gender, city, region = generate_customer()
-
-        data.append([
-            f"ORD_{i+1}",
-            order_date,
-            year,
-            month,
-            quarter,
-            customer_id,
-            age,
-            gender,
-            city,
-            region,
-            product,
-            category,
-            quantity,
-            unit_price,
-            discount,
-            cost_price,
-            payment_method,
-            round(revenue,2),
-            round(profit,2),
-            round(profit_margin,2)
-        ])
-
-    columns = [
-        "Order_ID","Order_Date","Year","Month","Quarter",
-        "Customer_ID","Age","Gender","City","Region",
-        "Product","Category","Quantity","Unit_Price",
-        "Discount_%","Cost_Price","Payment_Method",
-        "Revenue","Profit","Profit_Margin"
-    ]
+    date_range = pd.date_range(start=START_DATE, end=END_DATE)
+    order_date = date_range[np.random.randint(0, len(date_range), total_rows)]
+    year = order_date.year.to_numpy()
+    month = order_date.month.to_numpy()
+    quarter = (month - 1) // 3 + 1
+
+    growth_factor = pd.Series(year).map(YEAR_GROWTH).to_numpy()
+    seasonal_factor = pd.Series(month).map(MONTH_MULTIPLIER).to_numpy()
+
+    # COVID dip logic
+    covid = (year == 2020) & np.isin(month, [4, 5, 6, 7, 8])
+    seasonal_factor = np.where(covid, seasonal_factor * 0.75, seasonal_factor)
+
+    # Category first, then a product within it
+    category_names = list(CATEGORIES.keys())
+    category_idx = np.random.randint(0, len(category_names), total_rows)
+    category = np.array(category_names)[category_idx]
+    product_pick = np.random.random(total_rows)
+
+    product_key = np.empty(total_rows, dtype=np.int64)
+    unit_price = np.empty(total_rows)
+    for i, name in enumerate(category_names):
+        mask = category_idx == i
+        keys = products.loc[products["Category"] == name, "Product_Key"].to_numpy()
+        product_key[mask] = keys[(product_pick[mask] * len(keys)).astype(int)]
+        unit_price[mask] = np.random.uniform(*PRICE_RANGES[name], mask.sum())
+    unit_price = np.round(unit_price, 2)
+
+    quantity = np.random.randint(1, 5, total_rows)
+
+    festive = np.isin(month, [10, 11])
+    discount = np.where(
+        festive,
+        np.random.uniform(0.1, 0.3, total_rows),
+        np.random.uniform(0, 0.1, total_rows)
+    ).round(2)
+
+    cost_price = np.round(unit_price * np.random.uniform(0.6, 0.75, total_rows), 2)
+
+    revenue = unit_price * quantity * (1 - discount)
+    revenue *= growth_factor * seasonal_factor
+
+    if fixed_point:
+        # int64 paise; profit is derived in integers so it is exact
+        unit_price = to_paise(unit_price)
+        cost_price = to_paise(cost_price)
+        revenue = to_paise(revenue)
+
+    profit = revenue - (cost_price * quantity)
+    profit_margin = np.where(revenue > 0, profit / np.where(revenue > 0, revenue, 1), 0)
+
+    if not fixed_point:
+        revenue, profit = np.round(revenue, 2), np.round(profit, 2)
+
+    payment_method = np.random.choice(
+        PAYMENT_METHODS,
+        size=total_rows,
+        p=[0.4, 0.3, 0.2, 0.1]
+    )
 
-    df = pd.DataFrame(data, columns=columns)
-    return df
+    customer_idx = np.random.choice(
+        n_customers,
+        size=total_rows,
+        p=customer_weights(n_customers)
+    )
+    customer_key = customers["Customer_Key"].to_numpy()[customer_idx]
+    geo_key = customers["Geo_Key"].to_numpy()[customer_idx]
+
+    orders = pd.DataFrame({
+        "Order_Key": np.arange(1, total_rows + 1),
+        "Order_Date": order_date,
+        "Year": year,
+        "Month": month,
+        "Quarter": quarter,
+        "Customer_Key": customer_key,
+        "Product_Key": product_key,
+        "Geo_Key": geo_key,
+        "Quantity": quantity,
+        "Unit_Price": unit_price,
+        "Discount_%": discount,
+        "Cost_Price": cost_price,
+        "Payment_Method": payment_method,
+        "Revenue": revenue,
+        "Profit": profit,
+        "Profit_Margin": np.round(profit_margin, 2)
+    })
+
+    return {
+        "orders": orders,
+        "customers": customers,
+        "products": products,
+        "geography": geography
+    }
 
 
 if __name__ == "__main__":
-    df = generate_sales_data()
-    df.to_csv("data/raw/sales_raw.csv", index=False)
+    tables = generate_sales_data()
+    save_star_schema(tables, RAW_DIR, PAISE)
     print("✅ Enterprise sales dataset generated successfully!")
-
@@ -0,0 +1,198 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+RAW_DIR = "data/raw"
+PROCESSED_DIR = "data/processed"
+
+# Star schema: one integer-keyed fact table + small dimension tables
+TABLES = ["orders", "customers", "products", "geography"]
+
+TABLE_DTYPES = {
+    "orders": {
+        "Order_Key": "int32",
+        "Year": "int16",
+        "Month": "int8",
+        "Quarter": "int8",
+        "Customer_Key": "int32",
+        "Product_Key": "int16",
+        "Geo_Key": "int16",
+        "Quantity": "int16",
+        "Payment_Method": "category",
+        "Day": "int8"
+    },
+    "customers": {
+        "Customer_Key": "int32",
+        "Age": "int8",
+        "Gender": "category",
+        "Geo_Key": "int16"
+    },
+    "products": {
+        "Product_Key": "int16",
+        "Category": "category"
+    },
+    "geography": {
+        "Geo_Key": "int16",
+        "Region": "category"
+    }
+}
+
+
+CUSTOMER_ID_PREFIX = "CUST_"
+
+
+# Money is stored as int64 paise (fixed point) so sums are exact and the
+# same regardless of summation order or how partials are merged. The unit
+# is recorded with the data (schema.json next to the CSVs, and the shared
+# buffer manifest), never guessed from a column's dtype.
+PAISE_PER_RUPEE = 100
+PAISE = "paise"
+RUPEES = "rupees"
+
+SCHEMA_FILE = "schema.json"
+
+MONEY_COLUMNS = {
+    "orders": ["Unit_Price", "Cost_Price", "Revenue", "Profit"],
+    "customers": ["Customer_Lifetime_Value"]
+}
+
+
+# ----------------------------------------
+# 1. FIXED-POINT MONEY
+# ----------------------------------------
+
+def to_paise(values):
+    return np.rint(np.asarray(values, dtype=np.float64) * PAISE_PER_RUPEE).astype(np.int64)
+
+
+def money_scale(unit):
+
+    # Divisor that turns a money figure in this unit into rupees
+    if unit == PAISE:
+        return PAISE_PER_RUPEE
+    if unit == RUPEES:
+        return 1
+    raise ValueError(f"Unknown money unit: {unit}")
+
+
+def to_rupees(value, scale):
+
+    # Display-time conversion only; everything upstream stays in paise
+    return value / scale
+
+
+def tables_to_paise(tables, unit):
+
+    # Every money column is converted together, whatever its dtype, so a
+    # table never mixes units (whole-rupee ints are still rupees)
+    money_scale(unit)
+    if unit == PAISE:
+        return dict(tables)
+
+    out = dict(tables)
+    for name, columns in MONEY_COLUMNS.items():
+        df = out[name].copy()
+        for col in columns:
+            if col in df.columns:
+                df[col] = to_paise(df[col])
+        out[name] = df
+
+    return out
+
+
+# ----------------------------------------
+# 2. SAVE / LOAD STAR SCHEMA
+# ----------------------------------------
+
+def table_path(directory, name):
+    return os.path.join(directory, f"{name}.csv")
+
+
+def save_star_schema(tables, directory, money_unit=PAISE):
+    money_scale(money_unit)
+    os.makedirs(directory, exist_ok=True)
+    for name in TABLES:
+        tables[name].to_csv(table_path(directory, name), index=False)
+    with open(os.path.join(directory, SCHEMA_FILE), "w") as f:
+        json.dump({"money_unit": money_unit}, f, indent=2)
+
+
+def read_money_unit(directory=PROCESSED_DIR):
+
+    # Star schemas written before the unit was recorded hold float rupees
+    path = os.path.join(directory, SCHEMA_FILE)
+    if not os.path.exists(path):
+        return RUPEES
+    with open(path) as f:
+        return json.load(f)["money_unit"]
+
+
+def load_star_schema(directory=PROCESSED_DIR):
+
+    tables = {}
+    for name in TABLES:
+        path = table_path(directory, name)
+        header = pd.read_csv(path, nrows=0).columns
+        dtypes = {
+            col: dtype for col, dtype in TABLE_DTYPES[name].items()
+            if col in header
+        }
+        tables[name] = pd.read_csv(path, dtype=dtypes)
+
+    tables["orders"]["Order_Date"] = pd.to_datetime(tables["orders"]["Order_Date"])
+
+    return tables
+
+
+# ----------------------------------------
+# 3. DIMENSION LOOKUPS
+# ----------------------------------------
+
+def dimension_lookup(dim, key, column):
+
+    # Key -> attribute mapping, used to label aggregated results
+    return dim.set_index(key)[column]
+
+
+def label_index(series, dim, key, column):
+
+    labelled = series.copy()
+    labelled.index = labelled.index.map(dimension_lookup(dim, key, column))
+    labelled.index.name = column
+
+    return labelled
+
+
+def customer_ids(keys, customers=None):
+
+    # Generated Customer_IDs are CUST_<key>; the shared buffers drop the
+    # column, so labels are rebuilt for just the keys being displayed
+    keys = pd.Index(keys)
+    if customers is not None and "Customer_ID" in customers.columns:
+        return keys.map(dimension_lookup(customers, "Customer_Key", "Customer_ID"))
+    return CUSTOMER_ID_PREFIX + keys.astype(str)
+
+
+def rollup(series, dim, key, column):
+
+    # Re-aggregate a key-level result up to a dimension attribute
+    groups = series.index.map(dimension_lookup(dim, key, column)).rename(column)
+    return series.groupby(groups, observed=True).sum()
+
+
+def join_dimensions(df, tables, columns):
+
+    # Attach dimension attributes to the fact table only when a row-level
+    # view is actually needed (exports, ad-hoc analysis)
+    out = df
+    for name, key in [("customers", "Customer_Key"),
+                      ("products", "Product_Key"),
+                      ("geography", "Geo_Key")]:
+        dim = tables[name]
+        wanted = [c for c in columns if c in dim.columns and c != key
+                  and c not in out.columns]
+        if wanted:
+            out = out.merge(dim[[key] + wanted], on=key, how="left")
+
+    return out
@@ -1,4 +1,8 @@
 import pandas as pd
+import numpy as np
+
+from src.data_loader import label_index, rollup, customer_ids
+from src.time_index import trailing_totals, range_growth
 
 # -----------------------------------------
 # 1. EXECUTIVE SUMMARY KPIs
@@ -8,13 +12,13 @@ def executive_summary(df):
 
     total_revenue = df["Revenue"].sum()
     total_profit = df["Profit"].sum()
-    total_orders = df["Order_ID"].nunique()
-    total_customers = df["Customer_ID"].nunique()
+    total_orders = df["Order_Key"].nunique()
+    total_customers = df["Customer_Key"].nunique()
 
     avg_order_value = total_revenue / total_orders
     profit_margin = (total_profit / total_revenue) * 100
 
-    repeat_customers = df["Customer_ID"].value_counts()
+    repeat_customers = df["Customer_Key"].value_counts()
     repeat_rate = (repeat_customers[repeat_customers > 1].count() 
                    / total_customers) * 100
 
@@ -57,26 +61,35 @@ def growth_metrics(df):
 # 3. PRODUCT PERFORMANCE
 # -----------------------------------------
 
-def product_performance(df):
+def product_performance(df, products, top_n=5):
+
+    # Aggregate on integer keys, then label via the product dimension
+    key_rev = df.groupby("Product_Key")["Revenue"].sum()
 
-    product_rev = df.groupby("Product")["Revenue"].sum().sort_values(ascending=False)
+    product_rev = label_index(key_rev, products, "Product_Key", "Product")
+    product_rev = product_rev.sort_values(ascending=False)
 
-    top_5 = product_rev.head(5)
-    bottom_5 = product_rev.tail(5)
+    top = product_rev.head(top_n)
+    bottom = product_rev.tail(top_n)
 
-    category_rev = df.groupby("Category")["Revenue"].sum().sort_values(ascending=False)
+    category_rev = rollup(key_rev, products, "Product_Key", "Category")
+    category_rev = category_rev.sort_values(ascending=False)
 
-    return top_5, bottom_5, category_rev
+    return top, bottom, category_rev
 
 
 # -----------------------------------------
 # 4. REGIONAL PERFORMANCE
 # -----------------------------------------
 
-def regional_performance(df):
+def regional_performance(df, geography):
 
-    region_rev = df.groupby("Region")["Revenue"].sum().sort_values(ascending=False)
-    region_profit = df.groupby("Region")["Profit"].sum().sort_values(ascending=False)
+    geo = df.groupby("Geo_Key")[["Revenue", "Profit"]].sum()
+
+    region_rev = rollup(geo["Revenue"], geography, "Geo_Key", "Region")
+    region_rev = region_rev.sort_values(ascending=False)
+    region_profit = rollup(geo["Profit"], geography, "Geo_Key", "Region")
+    region_profit = region_profit.sort_values(ascending=False)
 
     return region_rev, region_profit
 
@@ -85,18 +98,75 @@ def regional_performance(df):
 # 5. CUSTOMER INSIGHTS
 # -----------------------------------------
 
-def customer_insights(df):
+def customer_insights(df, customers):
 
-    clv = df.groupby("Customer_ID")["Revenue"].sum().sort_values(ascending=False)
+    clv = df.groupby("Customer_Key")["Revenue"].sum().sort_values(ascending=False)
 
     high_value = clv.head(10)
+    high_value.index = customer_ids(high_value.index, customers).rename("Customer_ID")
 
+    # Age lives on the customer dimension: bin per customer, not per order
+    age = clv.index.map(customers.set_index("Customer_Key")["Age"])
     age_group = pd.cut(
-        df["Age"],
+        age,
         bins=[18,25,35,50,70],
         labels=["18-25","26-35","36-50","50+"]
     )
 
-    age_revenue = df.groupby(age_group)["Revenue"].sum()
+    age_revenue = clv.groupby(age_group, observed=False).sum()
 
     return high_value, age_revenue
+
+
+# -----------------------------------------
+# 6. ROLLING WINDOW KPIs (from a time index)
+# -----------------------------------------
+
+def rolling_metrics(index, windows=(7, 30, 90, 365), group=None):
+
+    end = index["end"]
+    metrics = {}
+
+    for days in windows:
+        totals = trailing_totals(index, days, end, group)
+        growth = range_growth(
+            index, end - pd.Timedelta(days=days - 1), end, group=group
+        )
+
+        metrics[f"Trailing {days}d Revenue"] = round(totals["Revenue"], 2)
+        metrics[f"Trailing {days}d Profit"] = round(totals["Profit"], 2)
+        metrics[f"Trailing {days}d Orders"] = totals["Orders"]
+        metrics[f"Trailing {days}d Revenue Growth %"] = round(growth["Revenue"], 2)
+
+    return metrics
+
+
+# -----------------------------------------
+# 7. STRATEGIC SCORECARD
+# -----------------------------------------
+
+def business_scores(monthly_revenue, top_share, margin):
+
+    # Vectorized over leading axes: monthly_revenue may be a single series
+    # (n_months,) or a batch of simulated series (n_paths, n_months)
+    revenue = np.asarray(monthly_revenue, dtype=float)
+
+    growth = np.mean(revenue[..., 1:] / revenue[..., :-1] - 1, axis=-1)
+    momentum = np.clip((growth*100)+50, 0, 100)
+
+    volatility = revenue.std(axis=-1, ddof=1) / revenue.mean(axis=-1)
+    stability = np.clip(100-(volatility*100), 0, 100)
+
+    diversification = np.clip((1-np.asarray(top_share))*100, 0, 100)
+
+    profitability = np.clip(np.asarray(margin)*200, 0, 100)
+
+    overall = (momentum + stability + diversification + profitability) / 4
+
+    return {
+        "Momentum": momentum,
+        "Stability": stability,
+        "Diversification": diversification,
+        "Profitability": profitability,
+        "Business Health": overall
+    }
@@ -0,0 +1,137 @@
+import json
+import time
+import asyncio
+import argparse
+
+import numpy as np
+import aiohttp
+
+URL = "http://127.0.0.1:8765/query"
+
+# A typical dashboard refresh: headline KPIs plus a filtered breakdown and
+# a constant-time date-range lookup
+DEFAULT_BATCH = {
+    "queries": [
+        {"name": "summary"},
+        {"name": "products"},
+        {"name": "regions", "filters": {"start": "2023-01-01"}},
+        {"name": "customers"},
+        {"name": "range", "params": {"start": "2023-07-01", "end": "2023-09-30", "by": "Region", "group": "West"}}
+    ]
+}
+
+REGIONS = ["North", "South", "East", "West"]
+FIRST_DAY = np.datetime64("2019-01-01")
+N_DAYS = 5 * 365
+
+
+def varied_batch(rng):
+
+    # Same shape as DEFAULT_BATCH with a random date window and region, so
+    # practically every query misses the cache and is computed + serialized
+    start = FIRST_DAY + int(rng.integers(0, N_DAYS - 30))
+    end = start + int(rng.integers(7, 365))
+    region = str(rng.choice(REGIONS))
+    window = {"start": str(start), "end": str(end)}
+
+    return {
+        "queries": [
+            {"name": "summary", "filters": {**window, "Region": region}},
+            {"name": "products", "filters": {**window, "Region": region}},
+            {"name": "regions", "filters": window},
+            {"name": "customers", "filters": {**window, "Region": region}},
+            {"name": "range", "params": {**window, "by": "Region", "group": region}}
+        ]
+    }
+
+
+# ----------------------------------------
+# 1. CONCURRENT CLIENTS
+# ----------------------------------------
+
+async def _client(session, url, make_payload, n_requests, headers, latencies, errors):
+
+    for _ in range(n_requests):
+        body = json.dumps(make_payload())
+        start = time.perf_counter()
+        try:
+            async with session.post(url, data=body, headers=headers) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load_test(url=URL, clients=16, requests_per_client=50,
+                        payload=None, fmt="json", mode="warm", seed=0):
+
+    # warm: every client repeats one batch, so after the first request this
+    # measures HTTP + cache lookups. cold: every request is a new batch, so
+    # it measures filtering, aggregation and serialization as well.
+    payload = payload or DEFAULT_BATCH
+    if mode == "cold":
+        rngs = [np.random.default_rng(seed + i) for i in range(clients)]
+        factories = [lambda rng=rng: varied_batch(rng) for rng in rngs]
+    else:
+        factories = [lambda: payload] * clients
+
+    headers = {"Content-Type": "application/json"}
+    if fmt == "npz":
+        headers["Accept"] = "application/x-npz"
+
+    latencies, errors = [], []
+    connector = aiohttp.TCPConnector(limit=clients)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _client(session, url, make_payload, requests_per_client, headers, latencies, errors)
+            for make_payload in factories
+        ))
+        elapsed = time.perf_counter() - start
+
+    return {"Mode": mode, **summarize(latencies, errors, elapsed, clients)}
+
+
+# ----------------------------------------
+# 2. THROUGHPUT & LATENCY PERCENTILES
+# ----------------------------------------
+
+def summarize(latencies, errors, elapsed, clients):
+
+    ms = np.asarray(latencies) * 1000
+
+    return {
+        "Clients": clients,
+        "Requests": len(latencies) + len(errors),
+        "Errors": len(errors),
+        "Elapsed_s": round(elapsed, 3),
+        "Throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(ms, 50)), 2) if len(ms) else None,
+        "p95_ms": round(float(np.percentile(ms, 95)), 2) if len(ms) else None,
+        "p99_ms": round(float(np.percentile(ms, 99)), 2) if len(ms) else None,
+        "max_ms": round(float(ms.max()), 2) if len(ms) else None
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the analytics service")
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--format", choices=["json", "npz"], default="json")
+    parser.add_argument("--mode", choices=["cold", "warm"], nargs="+", default=["cold", "warm"],
+                        help="cold: a new filter/date window per request; warm: one repeated batch")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for mode in args.mode:
+        for clients in args.clients:
+            result = asyncio.run(run_load_test(
+                args.url, clients, args.requests, fmt=args.format, mode=mode, seed=args.seed
+            ))
+            print(json.dumps(result))
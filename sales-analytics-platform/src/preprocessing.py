@@ -1,22 +1,106 @@
+import os
 import pandas as pd
 import numpy as np
 
-RAW_PATH = "data/raw/sales_raw.csv"
-PROCESSED_PATH = "data/processed/sales_cleaned.csv"
+from src.data_loader import (
+    RAW_DIR, PROCESSED_DIR, PAISE, RUPEES, table_path, load_star_schema,
+    save_star_schema, read_money_unit, tables_to_paise
+)
+
+# Denormalized one-row-per-order file written by older generator versions
+LEGACY_RAW_PATH = "data/raw/sales_raw.csv"
 
 
 # ----------------------------------------
 # 1. Load Data
 # ----------------------------------------
 
-def load_data(path=RAW_PATH):
+def load_data(directory=RAW_DIR):
+    if not os.path.exists(table_path(directory, "orders")) \
+            and os.path.exists(LEGACY_RAW_PATH):
+        return normalize_flat(load_flat_data())
+
+    # Processed data is always paise, whatever unit the raw schema recorded
+    return tables_to_paise(load_star_schema(directory), read_money_unit(directory))
+
+
+def load_flat_data(path=LEGACY_RAW_PATH):
     df = pd.read_csv(path)
     df["Order_Date"] = pd.to_datetime(df["Order_Date"])
     return df
 
 
 # ----------------------------------------
-# 2. Data Validation & Cleaning
+# 2. Star Schema From Flat Data
+# ----------------------------------------
+
+def normalize_flat(df, fixed_point=True):
+
+    df = df.sort_values("Order_Date", kind="stable")
+
+    # Geography dimension
+    geography = (
+        df[["City", "Region"]].drop_duplicates("City")
+        .sort_values("City").reset_index(drop=True)
+    )
+    geography.insert(0, "Geo_Key", np.arange(1, len(geography) + 1))
+
+    # Product dimension
+    products = (
+        df[["Product", "Category"]].drop_duplicates("Product")
+        .sort_values(["Category", "Product"]).reset_index(drop=True)
+    )
+    products.insert(0, "Product_Key", np.arange(1, len(products) + 1))
+
+    geo_key = df["City"].map(geography.set_index("City")["Geo_Key"])
+    product_key = df["Product"].map(products.set_index("Product")["Product_Key"])
+
+    # Customer dimension: one consistent row per customer, taken from
+    # their most recent order
+    latest = df.assign(Geo_Key=geo_key).drop_duplicates("Customer_ID", keep="last")
+    customers = latest[["Customer_ID", "Age", "Gender", "Geo_Key"]]
+    customers = customers.sort_values(
+        "Customer_ID",
+        key=lambda s: s.str.extract(r"(\d+)$")[0].astype(float)
+    ).reset_index(drop=True)
+    customers.insert(0, "Customer_Key", np.arange(1, len(customers) + 1))
+
+    customer_key = df["Customer_ID"].map(
+        customers.set_index("Customer_ID")["Customer_Key"]
+    )
+
+    orders = pd.DataFrame({
+        "Order_Key": df["Order_ID"].str.extract(r"(\d+)$")[0].astype(int),
+        "Order_Date": df["Order_Date"],
+        "Year": df["Year"],
+        "Month": df["Month"],
+        "Quarter": df["Quarter"],
+        "Customer_Key": customer_key,
+        "Product_Key": product_key,
+        "Geo_Key": geo_key,
+        "Quantity": df["Quantity"],
+        "Unit_Price": df["Unit_Price"],
+        "Discount_%": df["Discount_%"],
+        "Cost_Price": df["Cost_Price"],
+        "Payment_Method": df["Payment_Method"],
+        "Revenue": df["Revenue"],
+        "Profit": df["Profit"],
+        "Profit_Margin": df["Profit_Margin"]
+    }).sort_values("Order_Key").reset_index(drop=True)
+
+    tables = {
+        "orders": orders,
+        "customers": customers,
+        "products": products,
+        "geography": geography
+    }
+
+    # Legacy files hold rupees (floats, or ints for whole-rupee prices)
+    return tables_to_paise(tables, RUPEES) if fixed_point else tables
+
+
+# ----------------------------------------
+# 3. Data Validation & Cleaning
 # ----------------------------------------
 
 def clean_data(df):
@@ -38,32 +122,33 @@ def clean_data(df):
 
 
 # ----------------------------------------
-# 3. Feature Engineering
+# 4. Feature Engineering
 # ----------------------------------------
 
-def engineer_features(df):
+def engineer_features(tables):
 
-    # Time Features
-    df["Month_Name"] = df["Order_Date"].dt.month_name()
-    df["Day"] = df["Order_Date"].dt.day
-    df["Weekday"] = df["Order_Date"].dt.day_name()
+    df = tables["orders"].copy()
+    customers = tables["customers"].copy()
 
-    # Order Value
-    df["Order_Value"] = df["Revenue"]
+    # Time Features (names such as Month_Name / Weekday are derived from
+    # Order_Date at display time instead of being stored per order)
+    df["Day"] = df["Order_Date"].dt.day
 
     # Profit Margin %
     df["Profit_Margin_%"] = (df["Profit"] / df["Revenue"]) * 100
 
-    # Customer Lifetime Value (Basic)
-    clv = df.groupby("Customer_ID")["Revenue"].sum().reset_index()
-    clv.columns = ["Customer_ID", "Customer_Lifetime_Value"]
-    df = df.merge(clv, on="Customer_ID", how="left")
+    # Customer Lifetime Value (Basic) is a customer attribute
+    clv = df.groupby("Customer_Key")["Revenue"].sum()
+    # reindex keeps int64 paise exact (map + fillna would go through float)
+    customers["Customer_Lifetime_Value"] = (
+        clv.reindex(customers["Customer_Key"], fill_value=0).to_numpy()
+    )
 
-    return df
+    return {**tables, "orders": df, "customers": customers}
 
 
 # ----------------------------------------
-# 4. Monthly Aggregation for Growth
+# 5. Monthly Aggregation for Growth
 # ----------------------------------------
 
 def calculate_growth_metrics(df):
@@ -86,11 +171,11 @@ def calculate_growth_metrics(df):
 
 
 # ----------------------------------------
-# 5. Save Processed Data
+# 6. Save Processed Data
 # ----------------------------------------
 
-def save_processed_data(df, path=PROCESSED_PATH):
-    df.to_csv(path, index=False)
+def save_processed_data(tables, directory=PROCESSED_DIR, money_unit=PAISE):
+    save_star_schema(tables, directory, money_unit)
 
 
 # ----------------------------------------
@@ -98,9 +183,9 @@ def save_processed_data(df, path=PROCESSED_PATH):
 # ----------------------------------------
 
 if __name__ == "__main__":
-    df = load_data()
-    df = clean_data(df)
-    df = engineer_features(df)
-    save_processed_data(df)
+    tables = load_data()
+    tables["orders"] = clean_data(tables["orders"])
+    tables = engineer_features(tables)
+    save_processed_data(tables)
 
     print("✅ Data cleaning and feature engineering completed.")
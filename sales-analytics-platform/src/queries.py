@@ -0,0 +1,157 @@
+import os
+import functools
+
+import pandas as pd
+
+from src.kpi import (
+    executive_summary, growth_metrics, product_performance,
+    regional_performance, customer_insights
+)
+from src.segmentation import run_segmentation
+from src.forecasting import run_forecasting
+from src.simulation import run_simulation, SCENARIOS
+from src.cohorts import run_cohort_analysis
+from src.affinity import run_affinity
+from src.shared_data import SHARED_DIR, attach, data_version
+from src.query_cache import QUERY_CACHE
+
+# Upper bound on client-requested Monte Carlo paths (n_paths x 12 months of
+# float64 per scenario)
+MAX_PATHS = 200_000
+
+# Filters that name a dimension attribute: (table, fact key)
+FILTER_SOURCES = {
+    "Region": ("geography", "Geo_Key"),
+    "City": ("geography", "Geo_Key"),
+    "Category": ("products", "Product_Key"),
+    "Product": ("products", "Product_Key"),
+    "Gender": ("customers", "Customer_Key")
+}
+
+
+# ----------------------------------------
+# 1. FILTERS
+# ----------------------------------------
+
+def normalize_filters(filters=None):
+
+    # Canonical, hashable form so equal filters share a cache key:
+    # (("Region", ("North", "West")), ("start", "2023-01-01"), ...)
+    if isinstance(filters, tuple):
+        return filters
+
+    items = []
+    for name, value in sorted((filters or {}).items()):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(str(v) for v in value))
+        else:
+            value = str(value)
+        items.append((name, value))
+
+    return tuple(items)
+
+
+def apply_filters(tables, filters):
+
+    df = tables["orders"]
+    mask = pd.Series(True, index=df.index)
+
+    for name, value in filters:
+        if name == "start":
+            mask &= df["Order_Date"] >= pd.Timestamp(value)
+        elif name == "end":
+            mask &= df["Order_Date"] <= pd.Timestamp(value)
+        elif name in FILTER_SOURCES:
+            # Resolve attribute values to integer keys on the (small)
+            # dimension, then filter the fact table on the key column
+            table, key = FILTER_SOURCES[name]
+            dim = tables[table]
+            values = value if isinstance(value, tuple) else (value,)
+            keys = dim.loc[dim[name].astype(str).isin(values), key]
+            mask &= df[key].isin(keys)
+        else:
+            raise ValueError(f"Unknown filter: {name}")
+
+    return df if mask.all() else df[mask]
+
+
+# ----------------------------------------
+# 2. CACHED QUERIES
+# ----------------------------------------
+
+def cached_query(func):
+
+    @functools.wraps(func)
+    def wrapper(filters=None, directory=SHARED_DIR, **params):
+        filters = normalize_filters(filters)
+        key = (
+            func.__qualname__,
+            os.path.abspath(directory),
+            filters,
+            tuple(sorted(params.items()))
+        )
+
+        def compute():
+            tables = attach(directory)
+            return func(tables, apply_filters(tables, filters), **params)
+
+        return QUERY_CACHE.get_or_compute(key, data_version(directory), compute)
+
+    return wrapper
+
+
+@cached_query
+def summary(tables, df):
+    return executive_summary(df)
+
+
+@cached_query
+def products(tables, df, top_n=5):
+    return product_performance(df, tables["products"], top_n)
+
+
+@cached_query
+def regions(tables, df):
+    return regional_performance(df, tables["geography"])
+
+
+@cached_query
+def customers(tables, df):
+    return customer_insights(df, tables["customers"])
+
+
+@cached_query
+def segments(tables, df, with_ids=False):
+    return run_segmentation(df, tables["customers"] if with_ids else None)
+
+
+@cached_query
+def growth(tables, df):
+    return growth_metrics(df)
+
+
+@cached_query
+def forecast(tables, df):
+    return run_forecasting(df)
+
+
+@cached_query
+def simulation(tables, df, scenario="Base", n_paths=20000):
+    n_paths = min(max(int(n_paths), 1), MAX_PATHS)
+    return run_simulation(df, SCENARIOS[scenario], n_paths)
+
+
+@cached_query
+def cohorts(tables, df):
+    return run_cohort_analysis(df)
+
+
+@cached_query
+def affinity(tables, df, level="Product", top_n=5):
+    return run_affinity(df, tables["products"], level, top_n)
+
+
+def cache_stats():
+    return QUERY_CACHE.stats()
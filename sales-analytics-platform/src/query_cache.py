@@ -0,0 +1,141 @@
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+MAX_ENTRIES = 256
+MAX_BYTES = 256 * 1024 * 1024
+
+
+# ----------------------------------------
+# 1. RESULT SIZE ESTIMATE
+# ----------------------------------------
+
+def result_nbytes(value):
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            result_nbytes(k) + result_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(result_nbytes(v) for v in value)
+
+    return sys.getsizeof(value)
+
+
+# ----------------------------------------
+# 2. PROCESS-WIDE LRU CACHE
+# ----------------------------------------
+
+class QueryCache:
+
+    # Entries are keyed by (query, parameters) and tagged with the data
+    # version they were computed from. Seeing a new version drops everything
+    # computed from the old one. Concurrent misses on the same key share one
+    # computation. Cached results are shared between callers and must be
+    # treated as read-only.
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    def _invalidate(self, version):
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._stats["evictions"] += 1
+
+    def get_or_compute(self, key, version, compute):
+
+        key = (version, key)
+
+        with self._lock:
+            self._invalidate(version)
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key][0]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        size = result_nbytes(value)
+        with self._lock:
+            self._inflight.pop(key, None)
+            # Results larger than the whole budget are returned uncached
+            if version == self._version and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                self._evict()
+        future.set_result(value)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+            return {
+                **self._stats,
+                "hit_rate_%": round(100 * self._stats["hits"] / lookups, 2) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "version": self._version
+            }
+
+
+QUERY_CACHE = QueryCache()
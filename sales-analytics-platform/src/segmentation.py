@@ -3,6 +3,8 @@ import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+from src.data_loader import customer_ids
+
 # ----------------------------------------
 # 1. CREATE RFM TABLE
 # ----------------------------------------
@@ -11,13 +13,14 @@ def create_rfm(df):
 
     snapshot_date = df["Order_Date"].max() + pd.Timedelta(days=1)
 
-    rfm = df.groupby("Customer_ID").agg({
-        "Order_Date": lambda x: (snapshot_date - x.max()).days,
-        "Order_ID": "count",
+    rfm = df.groupby("Customer_Key").agg({
+        "Order_Date": "max",
+        "Order_Key": "count",
         "Revenue": "sum"
     }).reset_index()
 
-    rfm.columns = ["Customer_ID", "Recency", "Frequency", "Monetary"]
+    rfm.columns = ["Customer_Key", "Recency", "Frequency", "Monetary"]
+    rfm["Recency"] = (snapshot_date - rfm["Recency"]).dt.days
 
     return rfm
 
@@ -86,11 +89,15 @@ def label_segments(rfm):
 # MAIN FUNCTION
 # ----------------------------------------
 
-def run_segmentation(df):
+def run_segmentation(df, customers=None):
 
     rfm = create_rfm(df)
     rfm = rfm_scoring(rfm)
     rfm = apply_kmeans(rfm)
     rfm = label_segments(rfm)
 
+    # Customer IDs are only joined in when the caller needs them
+    if customers is not None:
+        rfm["Customer_ID"] = customer_ids(rfm["Customer_Key"], customers)
+
     return rfm
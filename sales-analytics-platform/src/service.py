@@ -0,0 +1,351 @@
+import io
+import os
+import json
+import math
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from src import queries
+from src.queries import normalize_filters
+from src.query_cache import QUERY_CACHE
+from src.data_loader import PROCESSED_DIR
+from src.shared_data import SHARED_DIR, load_shared_tables, attach, data_version, money_unit
+from src.time_index import build_time_index, range_totals, range_growth
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BATCH = 64
+
+NPZ_TYPE = "application/x-npz"
+
+# Everything the service keeps resident between requests
+STATE = web.AppKey("state", dict)
+
+# Named parts of tuple-returning queries, so every result is a set of tables
+QUERY_PARTS = {
+    "products": ["top", "bottom", "category_revenue"],
+    "regions": ["revenue", "profit"],
+    "customers": ["high_value", "age_revenue"],
+    "forecast": ["monthly", "test_results", "future", "metrics"],
+    "simulation": ["intervals", "scores"]
+}
+
+CACHED_QUERIES = {
+    "summary": queries.summary,
+    "growth": queries.growth,
+    "products": queries.products,
+    "regions": queries.regions,
+    "customers": queries.customers,
+    "segments": queries.segments,
+    "forecast": queries.forecast,
+    "simulation": queries.simulation,
+    "cohorts": queries.cohorts,
+    "affinity": queries.affinity
+}
+
+
+# ----------------------------------------
+# 1. RESULTS AS COLUMNAR TABLES
+# ----------------------------------------
+
+def to_frame(value, name="value"):
+
+    if isinstance(value, pd.DataFrame):
+        if isinstance(value.index, pd.RangeIndex):
+            return value
+        return value.reset_index()
+    if isinstance(value, pd.Series):
+        return value.rename(value.name or name).reset_index()
+    if isinstance(value, dict):
+        return pd.DataFrame([value])
+
+    return pd.DataFrame({name: [value]})
+
+
+def result_tables(name, result):
+
+    if isinstance(result, tuple):
+        return {
+            part: to_frame(value, part)
+            for part, value in zip(QUERY_PARTS[name], result)
+        }
+    if isinstance(result, dict) and any(
+        isinstance(v, (pd.DataFrame, pd.Series)) for v in result.values()
+    ):
+        return {part: to_frame(value, part) for part, value in result.items()}
+
+    return {"result": to_frame(result, name)}
+
+
+def _json_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (pd.Timestamp, pd.Period)):
+        return str(value)
+    return value
+
+
+def tables_to_json(tables):
+    return {
+        part: {
+            str(col): [_json_value(v) for v in frame[col].tolist()]
+            for col in frame.columns
+        }
+        for part, frame in tables.items()
+    }
+
+
+def _column_array(series):
+    if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype) \
+            or pd.api.types.is_string_dtype(series.dtype) \
+            or isinstance(series.dtype, pd.PeriodDtype):
+        return np.asarray(series.astype(str), dtype=str)
+    return series.to_numpy()
+
+
+def results_to_npz(results):
+
+    # One array per column, named "<query index>.<part>.<column>"
+    arrays = {}
+    for i, result in enumerate(results):
+        if "error" in result:
+            arrays[f"{i}.error"] = np.array([result["error"]])
+            continue
+        for name, values in result.items():
+            arrays[f"{i}.{name}"] = values
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def results_to_json(results, version, unit):
+
+    # Cached fragments are already-encoded JSON strings
+    fragments = [
+        json.dumps(r) if isinstance(r, dict) else r
+        for r in results
+    ]
+    return '{"version": %s, "money_unit": %s, "results": [%s]}' % (
+        json.dumps(version), json.dumps(unit), ", ".join(fragments)
+    )
+
+
+# ----------------------------------------
+# 2. QUERY EXECUTION
+# ----------------------------------------
+
+def _time_index(state, by):
+
+    # Prefix-sum indexes stay resident per data version
+    version = data_version(state["shared_dir"])
+    key = (version, by)
+
+    with state["lock"]:
+        indexes = state["time_indexes"]
+        if key not in indexes:
+            for stale in [k for k in indexes if k[0] != version]:
+                del indexes[stale]
+            tables = attach(state["shared_dir"])
+            indexes[key] = build_time_index(tables["orders"], by=by, tables=tables)
+
+        return indexes[key]
+
+
+def reload_data(state):
+    load_shared_tables(state["source_dir"], state["shared_dir"])
+    return data_version(state["shared_dir"])
+
+
+def compute_result(state, name, filters, params):
+
+    if name in CACHED_QUERIES:
+        return CACHED_QUERIES[name](filters, directory=state["shared_dir"], **params)
+
+    if name == "range":
+        # The prefix-sum index is only keyed by date and one group-by
+        # attribute; filtering it would silently be ignored
+        if filters:
+            raise ValueError("range does not take filters; use params.by/params.group")
+        index = _time_index(state, params.get("by"))
+        growth = range_growth(
+            index, params["start"], params["end"],
+            params.get("compare", "previous"), params.get("group")
+        )
+        return {
+            **range_totals(index, params["start"], params["end"], params.get("group")),
+            **{f"{metric}_Growth_%": value for metric, value in growth.items()}
+        }
+
+    raise ValueError(f"Unknown query: {name}")
+
+
+def encode_result(fmt, name, result):
+
+    tables = result_tables(name, result)
+    if fmt == "npz":
+        return {
+            f"{part}.{col}": _column_array(frame[col])
+            for part, frame in tables.items() for col in frame.columns
+        }
+
+    return json.dumps({"name": name, "tables": tables_to_json(tables)}, default=str)
+
+
+def run_query(state, query, fmt="json"):
+
+    name = query.get("name")
+    filters = normalize_filters(query.get("filters"))
+    params = query.get("params") or {}
+
+    # The encoded response fragment is cached alongside the raw results, so
+    # repeated queries skip both the computation and the serialization
+    key = ("service", fmt, name, state["shared_dir"], filters,
+           json.dumps(params, sort_keys=True))
+
+    return QUERY_CACHE.get_or_compute(
+        key,
+        data_version(state["shared_dir"]),
+        lambda: encode_result(fmt, name, compute_result(state, name, filters, params))
+    )
+
+
+async def run_batch(state, batch, fmt="json"):
+
+    loop = asyncio.get_running_loop()
+
+    async def run_one(query):
+        try:
+            return await loop.run_in_executor(state["executor"], run_query, state, query, fmt)
+        except Exception as exc:
+            return {"name": query.get("name"), "error": f"{type(exc).__name__}: {exc}"}
+
+    return await asyncio.gather(*(run_one(q) for q in batch))
+
+
+# ----------------------------------------
+# 3. HTTP HANDLERS
+# ----------------------------------------
+
+def wants_npz(request):
+    return request.query.get("format") == "npz" or NPZ_TYPE in request.headers.get("Accept", "")
+
+
+async def handle_query(request):
+
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise web.HTTPBadRequest(text="Body must be JSON")
+
+    # Accept a single query object or {"queries": [...]}
+    batch = body.get("queries", [body]) if isinstance(body, dict) else body
+    if not isinstance(batch, list) or not batch:
+        raise web.HTTPBadRequest(text="Expected a query or a non-empty list of queries")
+    if len(batch) > MAX_BATCH:
+        raise web.HTTPBadRequest(text=f"At most {MAX_BATCH} queries per batch")
+    if not all(isinstance(query, dict) for query in batch):
+        raise web.HTTPBadRequest(text="Every query must be a JSON object")
+
+    state = request.app[STATE]
+    fmt = "npz" if wants_npz(request) else "json"
+    results = await run_batch(state, batch, fmt)
+    version = data_version(state["shared_dir"])
+    unit = money_unit(state["shared_dir"])
+
+    if fmt == "npz":
+        return web.Response(
+            body=results_to_npz(results),
+            content_type=NPZ_TYPE,
+            headers={"X-Data-Version": version, "X-Money-Unit": unit}
+        )
+
+    return web.Response(
+        text=results_to_json(results, version, unit),
+        content_type="application/json"
+    )
+
+
+async def handle_health(request):
+    state = request.app[STATE]
+    return web.json_response({
+        "status": "ok",
+        "version": data_version(state["shared_dir"]),
+        # From the published manifest; publishing only happens at startup
+        # or on an explicit /reload, never on the request path
+        "money_unit": money_unit(state["shared_dir"])
+    })
+
+
+async def handle_reload(request):
+
+    # Republishing reads the CSVs and rewrites the buffers, so it runs in the
+    # executor instead of blocking in-flight queries on the event loop
+    state = request.app[STATE]
+    loop = asyncio.get_running_loop()
+    version = await loop.run_in_executor(state["executor"], reload_data, state)
+    return web.json_response({"status": "ok", "version": version})
+
+
+async def handle_stats(request):
+    return web.json_response(queries.cache_stats())
+
+
+# ----------------------------------------
+# 4. APPLICATION
+# ----------------------------------------
+
+async def _startup(app):
+
+    state = app[STATE]
+    loop = asyncio.get_running_loop()
+
+    # Publish/attach the shared buffers and warm the common aggregates
+    await loop.run_in_executor(state["executor"], reload_data, state)
+    await run_batch(state, [
+        {"name": "summary"}, {"name": "products"},
+        {"name": "regions"}, {"name": "customers"}
+    ])
+    await loop.run_in_executor(state["executor"], _time_index, state, None)
+
+
+async def _cleanup(app):
+    app[STATE]["executor"].shutdown(wait=False)
+
+
+def create_app(source_dir=PROCESSED_DIR, shared_dir=SHARED_DIR, workers=None):
+
+    app = web.Application(client_max_size=1024 ** 2)
+    app[STATE] = {
+        "source_dir": source_dir,
+        "shared_dir": shared_dir,
+        "executor": ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)),
+        "time_indexes": {},
+        "lock": threading.Lock()
+    }
+
+    app.router.add_post("/query", handle_query)
+    app.router.add_post("/reload", handle_reload)
+    app.router.add_get("/health", handle_health)
+    app.router.add_get("/stats", handle_stats)
+
+    app.on_startup.append(_startup)
+    app.on_cleanup.append(_cleanup)
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local analytics service")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    web.run_app(create_app(workers=args.workers), host=args.host, port=args.port)
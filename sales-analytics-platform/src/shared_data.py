@@ -0,0 +1,291 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import (
+    PROCESSED_DIR, PAISE, RUPEES, SCHEMA_FILE, TABLES, table_path,
+    load_star_schema, read_money_unit, customer_ids
+)
+
+# Published column buffers (one .npy per column) live in one subdirectory
+# per data version; every process memory-maps the same files so the OS page
+# cache holds a single copy. CURRENT names the live version and is the only
+# file that is ever replaced.
+SHARED_DIR = "data/shared"
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+LOCK = ".publish.lock"
+
+# Older versions kept on disk for readers that resolved CURRENT just before
+# a switch
+KEEP_VERSIONS = 2
+
+# Per-process handles, so repeated attaches reuse the same mappings
+_ATTACHED = {}
+_ATTACH_LOCK = threading.Lock()
+
+
+# ----------------------------------------
+# 1. DATA VERSION
+# ----------------------------------------
+
+def source_version(source_dir=PROCESSED_DIR):
+
+    digest = hashlib.sha1()
+    for name in TABLES:
+        stat = os.stat(table_path(source_dir, name))
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    # The recorded money unit is part of the dataset
+    schema = os.path.join(source_dir, SCHEMA_FILE)
+    if os.path.exists(schema):
+        stat = os.stat(schema)
+        digest.update(f"schema:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()[:16]
+
+
+def data_version(directory=SHARED_DIR):
+    try:
+        with open(os.path.join(directory, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(directory=SHARED_DIR):
+    version = data_version(directory)
+    if version is None:
+        return None
+    with open(os.path.join(directory, version, MANIFEST)) as f:
+        return json.load(f)
+
+
+def money_unit(directory=SHARED_DIR):
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No published dataset in {directory}")
+    return manifest.get("money_unit", RUPEES)
+
+
+# ----------------------------------------
+# 2. PUBLISH COLUMNS AS READ-ONLY BUFFERS
+# ----------------------------------------
+
+# Columns that are a pure function of the key are not published: a
+# per-customer string label would be materialised privately in every
+# process. Labels are rebuilt for displayed keys only (customer_ids).
+DERIVED_COLUMNS = {
+    "customers": {"Customer_ID": lambda df: customer_ids(df["Customer_Key"])}
+}
+
+
+def _published_columns(name, df):
+    derived = DERIVED_COLUMNS.get(name, {})
+    return [
+        col for col in df.columns
+        if col not in derived
+        or not np.array_equal(df[col].astype(str).to_numpy(), np.asarray(derived[col](df)))
+    ]
+
+
+def _column_buffers(series):
+
+    # Strings/categories become integer codes + a small label array
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object \
+            or pd.api.types.is_string_dtype(series.dtype):
+        cat = series.astype("category")
+        labels = np.asarray(cat.cat.categories.astype(str), dtype=str)
+        return np.asarray(cat.cat.codes), labels
+
+    return series.to_numpy(), None
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    # msvcrt.LK_LOCK gives up after ~10s; keep waiting like flock does
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _publish_lock(directory):
+
+    # Serializes publishers across processes; readers never take it
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK), "w") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+def _write_version(tables, version, directory, money_unit):
+
+    # Each publisher stages in its own directory, so a crashed or concurrent
+    # writer can never clobber another's files
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=directory)
+    try:
+        manifest = {"version": version, "money_unit": money_unit, "tables": {}}
+        for name in TABLES:
+            columns = []
+            for col in _published_columns(name, tables[name]):
+                values, labels = _column_buffers(tables[name][col])
+                stem = f"{name}.{len(columns)}"
+                np.save(os.path.join(staging, f"{stem}.npy"), values)
+                if labels is not None:
+                    np.save(os.path.join(staging, f"{stem}.labels.npy"), labels)
+                columns.append({
+                    "name": col,
+                    "file": stem,
+                    "categorical": labels is not None
+                })
+            manifest["tables"][name] = {"rows": len(tables[name]), "columns": columns}
+
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        target = os.path.join(directory, version)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+def _switch_version(version, directory):
+
+    # Replacing the pointer file is atomic: readers see the old or the new
+    # version, never neither
+    fd, tmp = tempfile.mkstemp(prefix=".current-", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(directory, CURRENT))
+
+    versions = sorted(
+        (entry for entry in os.scandir(directory)
+         if entry.is_dir() and not entry.name.startswith(".") and entry.name != version),
+        key=lambda entry: entry.stat().st_mtime, reverse=True
+    )
+    for entry in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def publish(tables, version, directory=SHARED_DIR, money_unit=PAISE):
+
+    with _publish_lock(directory):
+        manifest = _write_version(tables, version, directory, money_unit)
+        _switch_version(version, directory)
+
+    return manifest
+
+
+def publish_if_stale(source_dir=PROCESSED_DIR, directory=SHARED_DIR):
+
+    version = source_version(source_dir)
+    if data_version(directory) == version:
+        return version
+
+    with _publish_lock(directory):
+        # Another process may have published while we waited for the lock
+        if data_version(directory) != version:
+            _write_version(
+                load_star_schema(source_dir), version, directory,
+                read_money_unit(source_dir)
+            )
+            _switch_version(version, directory)
+
+    return version
+
+
+# ----------------------------------------
+# 3. ATTACH (ZERO-COPY)
+# ----------------------------------------
+
+def _attach_table(path, spec):
+
+    columns = {}
+    for col in spec["columns"]:
+        values = np.asarray(np.load(os.path.join(path, col["file"] + ".npy"), mmap_mode="r"))
+        if col["categorical"]:
+            labels = np.load(os.path.join(path, col["file"] + ".labels.npy"), mmap_mode="r")
+            # validate=False with a matching dtype keeps the codes on the
+            # mapped buffer instead of copying them
+            dtype = pd.CategoricalDtype(pd.Index(np.asarray(labels)))
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        columns[col["name"]] = values
+
+    # copy=False keeps each column backed by its mapped buffer
+    return pd.DataFrame(columns, copy=False)
+
+
+def attach(directory=SHARED_DIR):
+
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No published dataset in {directory}")
+
+    key = (os.path.abspath(directory), manifest["version"])
+    with _ATTACH_LOCK:
+        if key not in _ATTACHED:
+            _ATTACHED.clear()
+            path = os.path.join(directory, manifest["version"])
+            _ATTACHED[key] = {
+                name: _attach_table(path, spec)
+                for name, spec in manifest["tables"].items()
+            }
+
+        return _ATTACHED[key]
+
+
+def load_shared_tables(source_dir=PROCESSED_DIR, directory=SHARED_DIR):
+    publish_if_stale(source_dir, directory)
+    return attach(directory)
+
+
+# ----------------------------------------
+# 4. PROCESS-POOL WORKERS
+# ----------------------------------------
+
+def _run_attached(args):
+    func, directory, item = args
+    return func(attach(directory), item)
+
+
+def pool_map(func, items, directory=SHARED_DIR, max_workers=None):
+
+    # Workers receive only the directory name and map the buffers
+    # themselves; the dataset is never pickled across processes
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_run_attached, [(func, directory, i) for i in items]))
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from src.forecasting import prepare_monthly_data, train_model, forecast_future
+from src.kpi import business_scores
+
+FEATURES = ["Time_Index", "Month_Sin", "Month_Cos"]
+
+N_PATHS = 20000
+
+# What-if presets. discount_change is extra discount depth (fraction of
+# price), price_elasticity the volume lift per unit of discount, and the
+# growth shock an annualised change in the revenue trend drawn per path.
+SCENARIOS = {
+    "Base": {},
+    "Deeper Discounts": {"discount_change": 0.05, "discount_sd": 0.01, "price_elasticity": 1.5},
+    "Growth Shock": {"growth_shock_mean": 0.10, "growth_shock_sd": 0.05},
+    "Downturn": {"growth_shock_mean": -0.15, "growth_shock_sd": 0.05}
+}
+
+
+# ----------------------------------------
+# 1. RESIDUAL BOOTSTRAP PATHS
+# ----------------------------------------
+
+def bootstrap_paths(model, monthly, future_df, n_paths=N_PATHS, rng=None):
+
+    rng = np.random.default_rng(42) if rng is None else rng
+
+    residuals = (monthly["Revenue"] - model.predict(monthly[FEATURES])).to_numpy()
+    point = future_df["Forecasted_Revenue"].to_numpy()
+
+    # One draw of (n_paths, horizon) residual indices, no Python loop
+    draws = rng.integers(0, len(residuals), size=(n_paths, len(point)))
+    paths = point + residuals[draws]
+
+    return np.maximum(paths, 0)
+
+
+# ----------------------------------------
+# 2. SCENARIO PERTURBATIONS
+# ----------------------------------------
+
+def apply_scenario(paths, base_margin, scenario=None, rng=None):
+
+    rng = np.random.default_rng(7) if rng is None else rng
+    scenario = scenario or {}
+    n_paths, horizon = paths.shape
+
+    # Growth shock compounds over the horizon: (1 + g) ** (t / 12)
+    shock = rng.normal(
+        scenario.get("growth_shock_mean", 0.0),
+        scenario.get("growth_shock_sd", 0.0),
+        size=(n_paths, 1)
+    )
+    t = np.arange(1, horizon + 1) / 12
+    revenue = paths * (1 + shock) ** t
+
+    # Deeper discount: price falls, volume rises with elasticity, and the
+    # cost share of each rupee of revenue goes up
+    discount = rng.normal(
+        scenario.get("discount_change", 0.0),
+        scenario.get("discount_sd", 0.0),
+        size=(n_paths, 1)
+    ).clip(0, 0.9)
+    elasticity = scenario.get("price_elasticity", 0.0)
+
+    revenue = revenue * (1 - discount) * (1 + elasticity * discount)
+    margin = 1 - (1 - base_margin) / (1 - discount)
+
+    return revenue, np.broadcast_to(margin, revenue.shape)
+
+
+# ----------------------------------------
+# 3. INTERVALS & SCORE DISTRIBUTIONS
+# ----------------------------------------
+
+def prediction_intervals(future_df, revenue_paths, levels=(80, 95)):
+
+    out = future_df[["Date", "Year", "Month", "Forecasted_Revenue"]].copy()
+
+    qs = [50]
+    for level in levels:
+        qs += [(100 - level) / 2, 100 - (100 - level) / 2]
+    values = np.percentile(revenue_paths, qs, axis=0)
+
+    out["Median_Revenue"] = values[0]
+    for i, level in enumerate(levels):
+        out[f"Lower_{level}"] = values[1 + 2 * i]
+        out[f"Upper_{level}"] = values[2 + 2 * i]
+
+    return out
+
+
+def simulate_scores(monthly, revenue_paths, margin_paths, top_share, base_margin):
+
+    history = monthly["Revenue"].to_numpy()
+    n_paths = revenue_paths.shape[0]
+
+    # Scorecard over history + each simulated year, all paths at once
+    series = np.hstack([np.broadcast_to(history, (n_paths, len(history))), revenue_paths])
+
+    hist_revenue = history.sum()
+    margin = (
+        (hist_revenue * base_margin + (revenue_paths * margin_paths).sum(axis=1))
+        / (hist_revenue + revenue_paths.sum(axis=1))
+    )
+
+    scores = business_scores(series, top_share, margin)
+
+    rows = []
+    for name, values in scores.items():
+        values = np.broadcast_to(values, (n_paths,))
+        rows.append({
+            "Score": name,
+            "Mean": round(values.mean(), 1),
+            "P5": round(np.percentile(values, 5), 1),
+            "P50": round(np.percentile(values, 50), 1),
+            "P95": round(np.percentile(values, 95), 1)
+        })
+
+    return pd.DataFrame(rows)
+
+
+# ----------------------------------------
+# MAIN PIPELINE
+# ----------------------------------------
+
+def run_simulation(df, scenario=None, n_paths=N_PATHS, seed=42):
+
+    rng = np.random.default_rng(seed)
+
+    monthly = prepare_monthly_data(df)
+    model, _, _ = train_model(monthly)
+    future_df = forecast_future(model, monthly)
+
+    base_margin = df["Profit"].sum() / df["Revenue"].sum()
+    product_share = df.groupby("Product_Key")["Revenue"].sum()
+    top_share = product_share.max() / product_share.sum()
+
+    paths = bootstrap_paths(model, monthly, future_df, n_paths, rng)
+    revenue, margin = apply_scenario(paths, base_margin, scenario, rng)
+
+    intervals = prediction_intervals(future_df, revenue)
+    scores = simulate_scores(monthly, revenue, margin, top_share, base_margin)
+
+    return intervals, scores
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from src.data_loader import dimension_lookup
+
+METRICS = ["Revenue", "Profit", "Orders"]
+
+# Group-by attributes that live on a dimension: (table, fact key)
+GROUP_SOURCES = {
+    "Region": ("geography", "Geo_Key"),
+    "City": ("geography", "Geo_Key"),
+    "Category": ("products", "Product_Key"),
+    "Product": ("products", "Product_Key")
+}
+
+
+# ----------------------------------------
+# 1. BUILD DAILY PREFIX-SUM INDEX
+# ----------------------------------------
+
+def _group_codes(df, by, tables):
+
+    if by in GROUP_SOURCES:
+        table, key = GROUP_SOURCES[by]
+        values = df[key].map(dimension_lookup(tables[table], key, by))
+    else:
+        values = df[by]
+
+    codes, labels = pd.factorize(values, sort=True)
+    return codes, list(labels)
+
+
+def build_time_index(df, by=None, tables=None):
+
+    start = df["Order_Date"].min().normalize()
+    end = df["Order_Date"].max().normalize()
+    n_days = (end - start).days + 1
+
+    day = ((df["Order_Date"].dt.normalize() - start).dt.days).to_numpy()
+
+    if by is None:
+        codes, labels = np.zeros(len(df), dtype=np.int64), []
+    else:
+        codes, labels = _group_codes(df, by, tables)
+        codes = codes + 1  # row 0 is reserved for the all-groups total
+
+    n_rows = len(labels) + 1
+    cell = codes * n_days + day
+
+    values = {
+        "Revenue": df["Revenue"].to_numpy(),
+        "Profit": df["Profit"].to_numpy(),
+        "Orders": None
+    }
+
+    cumulative = {}
+    for metric, weights in values.items():
+        daily = np.bincount(cell, weights=weights, minlength=n_rows * n_days)
+        if weights is not None and np.issubdtype(weights.dtype, np.integer):
+            # bincount sums in float64; daily sums of int64 paise are far
+            # below 2**53 so converting back is exact, and the prefix sums
+            # then stay in integers
+            daily = np.rint(daily).astype(np.int64)
+        daily = daily.reshape(n_rows, n_days)
+        if by is not None:
+            daily[0] = daily[1:].sum(axis=0)
+
+        # cum[:, i] = total of days [0, i); a leading zero column makes every
+        # range a single subtraction
+        cum = np.zeros((n_rows, n_days + 1), dtype=daily.dtype)
+        np.cumsum(daily, axis=1, out=cum[:, 1:])
+        cumulative[metric] = cum
+
+    return {
+        "start": start,
+        "end": end,
+        "by": by,
+        "groups": {label: i + 1 for i, label in enumerate(labels)},
+        "cumulative": cumulative
+    }
+
+
+# ----------------------------------------
+# 2. CONSTANT-TIME RANGE QUERIES
+# ----------------------------------------
+
+def _offset(index, date):
+    return (pd.Timestamp(date).normalize() - index["start"]).days
+
+
+def range_totals(index, start, end, group=None):
+
+    # Inclusive [start, end]; dates outside the data are clipped
+    n_days = index["cumulative"]["Revenue"].shape[1] - 1
+    lo = min(max(_offset(index, start), 0), n_days)
+    hi = min(max(_offset(index, end) + 1, lo), n_days)
+
+    row = 0 if group is None else index["groups"][group]
+
+    return {
+        metric: (cum[row, hi] - cum[row, lo]).item()
+        for metric, cum in index["cumulative"].items()
+    }
+
+
+def trailing_totals(index, days, end=None, group=None):
+
+    end = index["end"] if end is None else pd.Timestamp(end)
+    start = end - pd.Timedelta(days=days - 1)
+
+    return range_totals(index, start, end, group)
+
+
+def _pct_change(current, previous):
+    if previous == 0:
+        return np.nan
+    return (current - previous) / abs(previous) * 100
+
+
+def range_growth(index, start, end, compare="previous", group=None):
+
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+
+    if compare == "year":
+        prev_start = start - pd.DateOffset(years=1)
+        prev_end = end - pd.DateOffset(years=1)
+    else:
+        length = end - start + pd.Timedelta(days=1)
+        prev_start, prev_end = start - length, end - length
+
+    current = range_totals(index, start, end, group)
+    previous = range_totals(index, prev_start, prev_end, group)
+
+    return {
+        metric: _pct_change(current[metric], previous[metric])
+        for metric in METRICS
+    }
+
+
+# ----------------------------------------
+# 3. PERIOD TOTALS (e.g. MONTHLY) FROM BOUNDARIES
+# ----------------------------------------
+
+def period_totals(index, freq="MS", group=None):
+
+    # One subtraction per period instead of a groupby over all orders
+    n_days = index["cumulative"]["Revenue"].shape[1] - 1
+    periods = pd.date_range(
+        index["start"].to_period(freq[0]).to_timestamp(), index["end"], freq=freq
+    )
+    bounds = np.clip((periods - index["start"]).days, 0, n_days)
+    bounds = np.append(bounds, n_days)
+
+    row = 0 if group is None else index["groups"][group]
+
+    out = pd.DataFrame({"Date": periods})
+    for metric, cum in index["cumulative"].items():
+        out[metric] = np.diff(cum[row, bounds])
+
+    return out
@@ -8,14 +8,18 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import streamlit as st
-import numpy as np
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)
 
-from src.kpi import executive_summary
-from src.segmentation import run_segmentation
+from src.data_loader import money_scale, to_rupees
+from src.shared_data import load_shared_tables, data_version, money_unit
+from src.time_index import build_time_index, period_totals, range_totals, range_growth
+from src.kpi import rolling_metrics, business_scores
+from src import queries
 from src.forecasting import run_forecasting
+from src.simulation import run_simulation, SCENARIOS
+from src.cohorts import run_cohort_analysis
 
 st.set_page_config(page_title="SALES DATA ANALYSIS PLATFORM", layout="wide")
 
@@ -88,45 +92,53 @@ st.markdown("""
 
 # ================= LOAD DATA =================
 
-@st.cache_data
+# Every session gets the same per-process tables (no per-session copy); the
+# columns are read-only memory-mapped buffers shared by all processes on the
+# host. Staleness is checked on each rerun (a stat of the processed CSVs),
+# so edited data is republished without restarting the server.
+SHARED_DIR = os.path.join(PROJECT_ROOT, "data", "shared")
+
 def load_data():
-    path = os.path.join(PROJECT_ROOT, "data", "processed", "sales_cleaned.csv")
-    df = pd.read_csv(path)
-    df["Order_Date"] = pd.to_datetime(df["Order_Date"])
-    return df
+    return load_shared_tables(
+        os.path.join(PROJECT_ROOT, "data", "processed"),
+        SHARED_DIR
+    )
 
-df = load_data()
+tables = load_data()
+df = tables["orders"]
 
-# ================= STRATEGIC SCORING =================
+# Money is int64 paise end to end; convert to rupees only for display
+MONEY_SCALE = money_scale(money_unit(SHARED_DIR))
 
-def calculate_business_scores(df):
-    monthly = df.groupby(["Year","Month"])["Revenue"].sum().reset_index()
-    monthly["Date"] = pd.to_datetime(
-        monthly["Year"].astype(str)+"-"+monthly["Month"].astype(str)+"-01"
-    )
+def rupees(value):
+    return to_rupees(value, MONEY_SCALE)
 
-    growth = monthly["Revenue"].pct_change().mean()
-    momentum = min(max((growth*100)+50,0),100)
+# Daily prefix-sum indexes: any date-range total is two array lookups
+@st.cache_resource(max_entries=1)
+def load_time_indexes(version):
+    return {
+        None: build_time_index(df),
+        "Region": build_time_index(df, by="Region", tables=tables),
+        "Category": build_time_index(df, by="Category", tables=tables)
+    }
 
-    volatility = monthly["Revenue"].std()/monthly["Revenue"].mean()
-    stability = min(max(100-(volatility*100),0),100)
+time_indexes = load_time_indexes(data_version(SHARED_DIR))
+time_index = time_indexes[None]
 
-    product_share = df.groupby("Product")["Revenue"].sum()
+# ================= STRATEGIC SCORING =================
+
+def calculate_business_scores(df, index):
+    monthly = period_totals(index)
+
+    product_share = df.groupby("Product_Key")["Revenue"].sum()
     top_share = product_share.max()/product_share.sum()
-    diversification = min(max((1-top_share)*100,0),100)
 
-    margin = df["Profit"].sum()/df["Revenue"].sum()
-    profitability = min(max(margin*200,0),100)
+    totals = range_totals(index, index["start"], index["end"])
+    margin = totals["Profit"]/totals["Revenue"]
 
-    overall = np.mean([momentum,stability,diversification,profitability])
+    scores = business_scores(monthly["Revenue"], top_share, margin)
 
-    return {
-        "Momentum": round(momentum,1),
-        "Stability": round(stability,1),
-        "Diversification": round(diversification,1),
-        "Profitability": round(profitability,1),
-        "Business Health": round(overall,1)
-    }
+    return {name: round(float(value),1) for name, value in scores.items()}
 
 # ================= NAVIGATION =================
 
@@ -135,25 +147,31 @@ modules = [
     "Product Intelligence",
     "Regional Matrix",
     "Customer Segmentation",
+    "Cohort Retention",
     "Forecast Strategy"
 ]
 
 selected = st.selectbox("Select Module", modules)
 
+with st.sidebar.expander("Query Cache"):
+    st.json(queries.cache_stats())
+
 # ================= EXECUTIVE OVERVIEW =================
 
 if selected == "Executive Overview":
 
     st.markdown("<div class='section-title'>Executive Overview</div>", unsafe_allow_html=True)
 
-    kpis = executive_summary(df)
-    scores = calculate_business_scores(df)
+    # KPI / segmentation results come from the process-wide query cache, so
+    # every session and rerun shares one computation per data version
+    kpis = queries.summary(directory=SHARED_DIR)
+    scores = calculate_business_scores(df, time_index)
 
     c1,c2,c3,c4 = st.columns(4)
-    c1.metric("Total Revenue", f"₹{kpis['Total Revenue']:,.0f}")
-    c2.metric("Total Profit", f"₹{kpis['Total Profit']:,.0f}")
+    c1.metric("Total Revenue", f"₹{rupees(kpis['Total Revenue']):,.0f}")
+    c2.metric("Total Profit", f"₹{rupees(kpis['Total Profit']):,.0f}")
     c3.metric("Profit Margin", f"{kpis['Profit Margin %']}%")
-    c4.metric("Avg Order Value", f"₹{kpis['Average Order Value']:,.0f}")
+    c4.metric("Avg Order Value", f"₹{rupees(kpis['Average Order Value']):,.0f}")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -164,13 +182,52 @@ if selected == "Executive Overview":
     s4.markdown(f"<div class='scorecard'>Profitability<br><b>{scores['Profitability']}</b></div>", unsafe_allow_html=True)
     s5.markdown(f"<div class='scorecard'>Business Health<br><b>{scores['Business Health']}</b></div>", unsafe_allow_html=True)
 
-    monthly = df.groupby(["Year","Month"])["Revenue"].sum().reset_index()
-    monthly["Date"] = pd.to_datetime(monthly["Year"].astype(str)+"-"+monthly["Month"].astype(str)+"-01")
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    rolling = rolling_metrics(time_index, windows=(7, 30, 90, 365))
+    r1,r2,r3,r4 = st.columns(4)
+    for col, days in zip([r1,r2,r3,r4], [7, 30, 90, 365]):
+        col.metric(
+            f"Trailing {days}d Revenue",
+            f"₹{rupees(rolling[f'Trailing {days}d Revenue']):,.0f}",
+            f"{rolling[f'Trailing {days}d Revenue Growth %']}%"
+        )
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    f1,f2 = st.columns(2)
+    date_range = f1.date_input(
+        "Date Range",
+        value=(time_index["start"].date(), time_index["end"].date()),
+        min_value=time_index["start"].date(),
+        max_value=time_index["end"].date()
+    )
+    group_by = f2.selectbox("Breakdown", ["All", "Region", "Category"])
+
+    if len(date_range) == 2:
+        start, end = date_range
+        index = time_indexes[None if group_by == "All" else group_by]
+        groups = [None] if group_by == "All" else list(index["groups"])
+
+        rows = []
+        for group in groups:
+            totals = range_totals(index, start, end, group)
+            growth = range_growth(index, start, end, group=group)
+            rows.append({
+                group_by: group or "All",
+                "Revenue": round(rupees(totals["Revenue"]), 0),
+                "Profit": round(rupees(totals["Profit"]), 0),
+                "Orders": totals["Orders"],
+                "Revenue vs Prior Period %": round(growth["Revenue"], 1)
+            })
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+    monthly = period_totals(time_index)
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=monthly["Date"],
-        y=monthly["Revenue"],
+        y=rupees(monthly["Revenue"]),
         line=dict(color="#F3EDE7", width=5),
         fill="tozeroy",
         fillcolor="rgba(243,237,231,0.1)"
@@ -190,7 +247,8 @@ elif selected == "Product Intelligence":
 
     st.markdown("<div class='section-title'>Product Intelligence</div>", unsafe_allow_html=True)
 
-    product = df.groupby("Product")["Revenue"].sum().sort_values().tail(10).reset_index()
+    top_products, _, _ = queries.products(directory=SHARED_DIR, top_n=10)
+    product = rupees(top_products.sort_values()).reset_index()
 
     fig = px.bar(product, x="Revenue", y="Product", orientation="h",
                  color="Revenue", color_continuous_scale=["#3A2A25","#E8DFD8"])
@@ -198,13 +256,30 @@ elif selected == "Product Intelligence":
     fig.update_layout(font=dict(size=16,color="#F3EDE7"))
     st.plotly_chart(fig, use_container_width=True)
 
+    st.markdown("<div class='section-title'>Customers Who Bought This Also Bought</div>", unsafe_allow_html=True)
+
+    a1,a2 = st.columns(2)
+    level = a1.selectbox("Level", ["Product", "Category"])
+    affinity = queries.affinity(directory=SHARED_DIR, level=level)
+    item = a2.selectbox(level, sorted(affinity["Item"].unique()))
+
+    related = affinity[affinity["Item"] == item].sort_values("Lift")
+
+    fig = px.bar(related, x="Lift", y="Also_Bought", orientation="h",
+                 hover_data=["Co_Customers", "Confidence_%"],
+                 color="Lift", color_continuous_scale=["#3A2A25","#E8DFD8"])
+
+    fig.update_layout(font=dict(size=16,color="#F3EDE7"))
+    st.plotly_chart(fig, use_container_width=True)
+
 # ================= REGIONAL MATRIX =================
 
 elif selected == "Regional Matrix":
 
     st.markdown("<div class='section-title'>Regional Matrix</div>", unsafe_allow_html=True)
 
-    region = df.groupby("Region")["Revenue"].sum().reset_index()
+    region_rev, region_profit = queries.regions(directory=SHARED_DIR)
+    region = rupees(region_rev.sort_values()).reset_index()
 
     fig = px.bar(region, x="Revenue", y="Region", orientation="h",
                  color="Revenue", color_continuous_scale=["#5E4B43","#E8DFD8"])
@@ -218,7 +293,7 @@ elif selected == "Customer Segmentation":
 
     st.markdown("<div class='section-title'>Customer Segmentation</div>", unsafe_allow_html=True)
 
-    rfm = run_segmentation(df)
+    rfm = queries.segments(directory=SHARED_DIR)
     seg = rfm["Segment"].value_counts().reset_index()
     seg.columns = ["Segment","Count"]
 
@@ -228,6 +303,67 @@ elif selected == "Customer Segmentation":
     fig.update_layout(font=dict(size=16,color="#F3EDE7"))
     st.plotly_chart(fig, use_container_width=True)
 
+    high_value, age_revenue = queries.customers(directory=SHARED_DIR)
+
+    h1,h2 = st.columns(2)
+
+    top_customers = rupees(high_value.sort_values()).reset_index()
+    fig = px.bar(top_customers, x="Revenue", y="Customer_ID", orientation="h",
+                 color="Revenue", color_continuous_scale=["#3A2A25","#E8DFD8"])
+    fig.update_layout(title="Top Customers by Lifetime Value", font=dict(size=16,color="#F3EDE7"))
+    h1.plotly_chart(fig, use_container_width=True)
+
+    ages = rupees(age_revenue).rename_axis("Age_Group").reset_index()
+    fig = px.bar(ages, x="Age_Group", y="Revenue",
+                 color="Revenue", color_continuous_scale=["#5E4B43","#E8DFD8"])
+    fig.update_layout(title="Revenue by Age Group", font=dict(size=16,color="#F3EDE7"))
+    h2.plotly_chart(fig, use_container_width=True)
+
+# ================= COHORT RETENTION =================
+
+elif selected == "Cohort Retention":
+
+    st.markdown("<div class='section-title'>Cohort Retention</div>", unsafe_allow_html=True)
+
+    cohorts = run_cohort_analysis(df)
+    max_age = cohorts["retention"].shape[1] - 1
+    # Short histories get a narrower slider (min and max must differ)
+    horizon = st.slider(
+        "Months Since First Purchase",
+        min(3, max_age - 1), max_age, min(12, max_age)
+    ) if max_age > 0 else 0
+
+    retention = cohorts["retention"].iloc[:, :horizon + 1]
+    fig = px.imshow(
+        retention.to_numpy(),
+        x=retention.columns.astype(str),
+        y=retention.index.astype(str),
+        labels=dict(x="Months Since First Purchase", y="Cohort", color="Retention %"),
+        color_continuous_scale=["#3A2A25","#E8DFD8"],
+        zmax=max(retention.iloc[:, 1:].max().max(), 1),
+        aspect="auto"
+    )
+    fig.update_layout(font=dict(size=16,color="#F3EDE7"), height=700)
+    st.plotly_chart(fig, use_container_width=True)
+
+    curve = cohorts["curve"].iloc[:horizon + 1].reset_index()
+    fig = px.line(curve, x="Months_Since_First", y="Retention_%", markers=True)
+    fig.update_traces(line=dict(color="#F3EDE7", width=5))
+    fig.update_layout(font=dict(size=16,color="#F3EDE7"))
+    st.plotly_chart(fig, use_container_width=True)
+
+    cohort_revenue = rupees(cohorts["revenue"].iloc[:, :horizon + 1])
+    fig = px.imshow(
+        cohort_revenue.to_numpy(),
+        x=cohort_revenue.columns.astype(str),
+        y=cohort_revenue.index.astype(str),
+        labels=dict(x="Months Since First Purchase", y="Cohort", color="Revenue"),
+        color_continuous_scale=["#3A2A25","#E8DFD8"],
+        aspect="auto"
+    )
+    fig.update_layout(font=dict(size=16,color="#F3EDE7"), height=700)
+    st.plotly_chart(fig, use_container_width=True)
+
 # ================= FORECAST STRATEGY =================
 
 elif selected == "Forecast Strategy":
@@ -236,21 +372,44 @@ elif selected == "Forecast Strategy":
 
     monthly, test_results, future_forecast, metrics = run_forecasting(df)
 
-    st.metric("Model R² Score", f"{metrics['R2 Score']:.3f}")
+    m1,m2 = st.columns(2)
+    m1.metric("Model R² Score", f"{metrics['R2 Score']:.3f}")
+    scenario = m2.selectbox("Scenario", list(SCENARIOS))
+
+    intervals, score_dist = run_simulation(df, SCENARIOS[scenario])
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=monthly["Date"],
-        y=monthly["Revenue"],
+        y=rupees(monthly["Revenue"]),
         name="Actual",
         line=dict(color="#F3EDE7", width=5)
     ))
+    for level, fill in [(95, "rgba(199,181,172,0.15)"), (80, "rgba(199,181,172,0.3)")]:
+        fig.add_trace(go.Scatter(
+            x=intervals["Date"],
+            y=rupees(intervals[f"Upper_{level}"]),
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo="skip"
+        ))
+        fig.add_trace(go.Scatter(
+            x=intervals["Date"],
+            y=rupees(intervals[f"Lower_{level}"]),
+            name=f"{level}% Interval",
+            line=dict(width=0),
+            fill="tonexty",
+            fillcolor=fill
+        ))
     fig.add_trace(go.Scatter(
         x=future_forecast["Date"],
-        y=future_forecast["Forecasted_Revenue"],
+        y=rupees(future_forecast["Forecasted_Revenue"]),
         name="Forecast",
         line=dict(color="#C7B5AC", width=5, dash="dot")
     ))
 
     fig.update_layout(font=dict(size=16,color="#F3EDE7"))
     st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("<div class='section-title'>Scorecard Outlook</div>", unsafe_allow_html=True)
+    st.dataframe(score_dist, use_container_width=True, hide_index=True)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_generator import generate_sales_data
+from src.affinity import item_columns, co_occurrence, run_affinity
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate_sales_data(total_rows=5000, n_customers=400)
+
+
+def test_co_occurrence_matches_customer_sets(tables):
+    orders, products = tables["orders"], tables["products"]
+    col_of_key, labels = item_columns(products)
+    counts, n_customers = co_occurrence(orders, col_of_key, len(labels), chunk_size=37)
+
+    bought = pd.crosstab(orders["Customer_Key"], col_of_key[orders["Product_Key"]]) > 0
+    bought = bought.reindex(columns=range(len(labels)), fill_value=False).astype(int)
+    expected = bought.T.to_numpy() @ bought.to_numpy()
+
+    np.testing.assert_array_equal(counts.toarray(), expected)
+    assert n_customers == orders["Customer_Key"].nunique()
+
+
+@pytest.mark.parametrize("level", ["Product", "Category"])
+def test_result_does_not_depend_on_chunk_size(tables, level):
+    whole = run_affinity(tables["orders"], tables["products"], level, chunk_size=10 ** 6)
+    for chunk_size in (1, 50, 333):
+        chunked = run_affinity(tables["orders"], tables["products"], level, chunk_size=chunk_size)
+        pd.testing.assert_frame_equal(chunked, whole)
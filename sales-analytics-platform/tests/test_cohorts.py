@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_generator import generate_sales_data
+from src.cohorts import cohort_tables
+
+
+@pytest.fixture(scope="module")
+def orders():
+    return generate_sales_data(total_rows=5000, n_customers=400)["orders"]
+
+
+def _naive_pivots(df):
+    month = df["Order_Date"].dt.to_period("M")
+    cohort = month.groupby(df["Customer_Key"]).transform("min")
+    age = (month - cohort).apply(lambda offset: offset.n)
+
+    frame = pd.DataFrame({
+        "Cohort": cohort, "Age": age,
+        "Customer_Key": df["Customer_Key"], "Revenue": df["Revenue"]
+    })
+    active = frame.pivot_table(index="Cohort", columns="Age", values="Customer_Key", aggfunc="nunique")
+    revenue = frame.pivot_table(index="Cohort", columns="Age", values="Revenue", aggfunc="sum")
+    return active, revenue
+
+
+def _observed(table, naive):
+    # Compare only cells inside the observed window; the engine marks the
+    # rest NaN while the pivot leaves unobserved combinations missing
+    got = table.loc[naive.index, naive.columns].to_numpy()
+    want = naive.fillna(0).to_numpy()
+    mask = ~np.isnan(got)
+    return got[mask], want[mask]
+
+
+def test_active_and_revenue_match_pivot(orders):
+    tables = cohort_tables(orders)
+    naive_active, naive_revenue = _naive_pivots(orders)
+    tables["active"].index = tables["active"].index.astype(naive_active.index.dtype)
+    tables["revenue"].index = tables["revenue"].index.astype(naive_revenue.index.dtype)
+
+    np.testing.assert_array_equal(*_observed(tables["active"], naive_active))
+    np.testing.assert_array_equal(*_observed(tables["revenue"], naive_revenue))
+
+
+def test_cohort_sizes_and_first_month_retention(orders):
+    tables = cohort_tables(orders)
+    first = orders.groupby("Customer_Key")["Order_Date"].min().dt.to_period("M")
+
+    expected = first.value_counts().sort_index()
+    np.testing.assert_array_equal(tables["sizes"].to_numpy(), expected.to_numpy())
+    assert (tables["retention"][0] == 100).all()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_generator import generate_sales_data
+from src.data_loader import (
+    PAISE, RUPEES, MONEY_COLUMNS, join_dimensions, save_star_schema,
+    read_money_unit, money_scale
+)
+from src.preprocessing import normalize_flat, load_data
+from src.shared_data import publish, money_unit
+
+
+@pytest.fixture(scope="module")
+def rupee_tables():
+    return generate_sales_data(total_rows=500, n_customers=50, fixed_point=False)
+
+
+def _flat(tables):
+    # The old denormalized one-row-per-order layout
+    df = join_dimensions(
+        tables["orders"], tables,
+        ["Customer_ID", "Age", "Gender", "City", "Region", "Product", "Category"]
+    )
+    return df.assign(Order_ID="ORD_" + df["Order_Key"].astype(str)).drop(
+        columns=["Order_Key", "Customer_Key", "Product_Key", "Geo_Key"]
+    )
+
+
+def test_whole_rupee_prices_are_converted_with_the_rest(rupee_tables):
+    flat = _flat(rupee_tables)
+    # Whole-rupee prices arrive as integers while revenue stays float
+    flat["Unit_Price"] = flat["Unit_Price"].round().astype(np.int64)
+    flat["Cost_Price"] = flat["Cost_Price"].round().astype(np.int64)
+
+    orders = normalize_flat(flat)["orders"].set_index("Order_Key")
+    source = flat.set_index(flat["Order_ID"].str[4:].astype(int))
+
+    for col in MONEY_COLUMNS["orders"]:
+        expected = np.rint(source[col].astype(float) * 100).astype(np.int64)
+        np.testing.assert_array_equal(orders[col].to_numpy(), expected.loc[orders.index].to_numpy())
+
+
+def test_recorded_unit_drives_conversion(rupee_tables, tmp_path):
+    save_star_schema(rupee_tables, tmp_path, RUPEES)
+    assert read_money_unit(tmp_path) == RUPEES
+
+    tables = load_data(tmp_path)
+    expected = np.rint(rupee_tables["orders"]["Revenue"] * 100).astype(np.int64)
+    np.testing.assert_array_equal(tables["orders"]["Revenue"].to_numpy(), expected.to_numpy())
+
+
+def test_manifest_records_unit(tmp_path):
+    tables = generate_sales_data(total_rows=200, n_customers=20)
+    publish(tables, "v1", tmp_path, PAISE)
+
+    assert money_unit(tmp_path) == PAISE
+    assert money_scale(money_unit(tmp_path)) == 100
+
+
+def test_unknown_unit_is_rejected():
+    with pytest.raises(ValueError):
+        money_scale("dollars")
@@ -0,0 +1,110 @@
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from src.query_cache import QueryCache
+
+
+def test_hit_after_miss():
+    cache = QueryCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 42
+
+    assert cache.get_or_compute("q", "v1", compute) == 42
+    assert cache.get_or_compute("q", "v1", compute) == 42
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = QueryCache(max_entries=2)
+    cache.get_or_compute("a", "v1", lambda: 1)
+    cache.get_or_compute("b", "v1", lambda: 2)
+    cache.get_or_compute("a", "v1", lambda: 1)  # a is now most recent
+    cache.get_or_compute("c", "v1", lambda: 3)  # evicts b
+
+    calls = []
+    cache.get_or_compute("a", "v1", lambda: calls.append("a"))
+    cache.get_or_compute("b", "v1", lambda: calls.append("b"))
+    assert calls == ["b"]
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_eviction_by_bytes():
+    block = 1000 * 8
+    cache = QueryCache(max_bytes=2 * block + 100)
+    for key in "abc":
+        cache.get_or_compute(key, "v1", lambda: np.zeros(1000))
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+
+
+def test_result_larger_than_budget_is_not_cached():
+    cache = QueryCache(max_bytes=100)
+    value = cache.get_or_compute("big", "v1", lambda: np.zeros(1000))
+    assert len(value) == 1000
+    assert cache.stats()["entries"] == 0
+
+
+def test_new_version_invalidates():
+    cache = QueryCache()
+    cache.get_or_compute("q", "v1", lambda: "old")
+    assert cache.get_or_compute("q", "v2", lambda: "new") == "new"
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["invalidations"] == 1
+    assert stats["version"] == "v2"
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = QueryCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute("q", "v1", compute)))
+    owner.start()
+    started.wait(5)
+
+    waiters = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("q", "v1", compute)))
+        for _ in range(4)
+    ]
+    for t in waiters:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in [owner] + waiters:
+        t.join(5)
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failures_propagate_and_are_not_cached():
+    cache = QueryCache()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("q", "v1", fail)
+    assert cache.get_or_compute("q", "v1", lambda: "ok") == "ok"
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_generator import generate_sales_data
+from src.data_loader import dimension_lookup
+from src.time_index import build_time_index, range_totals, period_totals
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate_sales_data(total_rows=5000, n_customers=400)
+
+
+def _naive_totals(df, start, end):
+    day = df["Order_Date"].dt.normalize()
+    window = df[(day >= start) & (day <= end)]
+    return {
+        "Revenue": window["Revenue"].sum(),
+        "Profit": window["Profit"].sum(),
+        "Orders": len(window)
+    }
+
+
+def test_range_totals_match_filtering(tables):
+    df = tables["orders"]
+    index = build_time_index(df)
+    rng = np.random.default_rng(0)
+    days = pd.date_range(index["start"], index["end"])
+
+    for _ in range(300):
+        start, end = sorted(rng.choice(days, 2))
+        assert range_totals(index, start, end) == _naive_totals(df, start, end)
+
+
+def test_grouped_range_totals_match_filtering(tables):
+    df = tables["orders"]
+    index = build_time_index(df, by="Region", tables=tables)
+    region = df["Geo_Key"].map(dimension_lookup(tables["geography"], "Geo_Key", "Region"))
+    start, end = pd.Timestamp("2021-03-15"), pd.Timestamp("2022-08-01")
+
+    for group in index["groups"]:
+        expected = _naive_totals(df[region == group], start, end)
+        assert range_totals(index, start, end, group) == expected
+
+
+def test_integer_money_stays_integer(tables):
+    index = build_time_index(tables["orders"])
+    totals = range_totals(index, index["start"], index["end"])
+    assert isinstance(totals["Revenue"], int)
+    assert totals["Revenue"] == tables["orders"]["Revenue"].sum()
+
+
+def test_period_totals_match_groupby(tables):
+    df = tables["orders"]
+    monthly = period_totals(build_time_index(df))
+    expected = df.groupby(df["Order_Date"].dt.to_period("M"))["Revenue"].sum()
+
+    np.testing.assert_array_equal(monthly["Revenue"].to_numpy(), expected.to_numpy())